@@ -1,31 +1,53 @@
 import contextlib
+import logging
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fast_cache_middleware import FastCacheMiddleware, CacheConfig
+from fast_cache_middleware.exceptions import NotFoundStorageError, TTLExpiredStorageError
 import os
 import uvicorn
 from datetime import datetime
 
 # Import your existing MCP server
-from server import mcp, TAVILY_API_KEY, GEMINI_AVAILABLE, project_state
+import server
+from server import mcp, TAVILY_API_KEY, project_state, refresh_project_state, close_http_client
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage the MCP server lifecycle"""
     async with mcp.session_manager.run():
         yield
+    await close_http_client()
 
 # Create FastAPI app
 app = FastAPI(
     title="AI Software Engineering Team",
     description="Advanced AI-powered software development automation system with FastAPI integration",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Cache the read-only status endpoints in memory; / and /project are left
+# uncached because they must reflect project state changes made through MCP tool calls
+app.add_middleware(FastCacheMiddleware)
+
+
+class _CacheMissFilter(logging.Filter):
+    """Drop the ERROR record the middleware logs for every ordinary cache miss"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not any(isinstance(arg, (NotFoundStorageError, TTLExpiredStorageError)) for arg in record.args or ())
+
+
+logging.getLogger("fast_cache_middleware.controller").addFilter(_CacheMissFilter())
+
 # Mount the MCP server
 app.mount("/mcp", mcp.streamable_http_app())
 
 @app.get("/")
 async def root():
+    await refresh_project_state()
     return {
         "service": "AI Software Engineering Team",
         "version": "2.0.0",
@@ -35,7 +57,7 @@ async def root():
         "current_project": project_state.get("current_project"),
         "services": {
             "tavily_search": "✅ Connected" if TAVILY_API_KEY else "❌ Not configured",
-            "gemini_ai": "✅ Connected" if GEMINI_AVAILABLE else "❌ Not available"
+            "gemini_ai": "✅ Connected" if server.GEMINI_AVAILABLE else "❌ Not available"
         },
         "endpoints": {
             "mcp": "/mcp",
@@ -46,7 +68,7 @@ async def root():
         }
     }
 
-@app.get("/health")
+@app.get("/health", dependencies=[CacheConfig(max_age=5)])
 async def health_check():
     return {
         "status": "healthy",
@@ -54,34 +76,37 @@ async def health_check():
         "services": {
             "mcp_server": "running",
             "tavily_api": "connected" if TAVILY_API_KEY else "not_configured",
-            "gemini_ai": "connected" if GEMINI_AVAILABLE else "not_available"
+            "gemini_ai": "connected" if server.GEMINI_AVAILABLE else "not_available"
         }
     }
 
 @app.get("/project")
 async def get_project_status():
     """Get current project status via REST API"""
+    await refresh_project_state()
+    modules = project_state["code_modules"]
     return {
         "current_project": project_state.get("current_project"),
         "has_requirements": project_state.get("requirements") is not None,
         "has_architecture": project_state.get("architecture") is not None,
         "has_implementation_plan": project_state.get("implementation_plan") is not None,
-        "code_modules_count": len(project_state.get("code_modules", {})),
+        "code_modules_count": len(modules),
         "has_deployment_plan": project_state.get("deployment_plan") is not None,
-        "available_modules": list(project_state.get("code_modules", {}).keys())
+        "available_modules": list(modules)
     }
 
-@app.get("/tools")
+@app.get("/tools", dependencies=[CacheConfig(max_age=30)])
 async def list_tools():
     """List all available MCP tools"""
+    tools = await mcp.list_tools()
     return {
-        "total_tools": len(mcp._tools),
+        "total_tools": len(tools),
         "tools": [
             {
-                "name": name,
+                "name": tool.name,
                 "description": tool.description or "No description available"
             }
-            for name, tool in mcp._tools.items()
+            for tool in tools
         ]
     }
 
@@ -104,4 +129,8 @@ if __name__ == "__main__":
     print(f"  • API Docs: http://localhost:{PORT}/docs")
     print("\n" + "="*80 + "\n")
     
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
\ No newline at end of file
+    # Single-process server for local development; see gunicorn_conf.py for
+    # multi-worker deployments.
+    # uvicorn[standard] provides uvloop and httptools; "auto" picks uvloop
+    # where it is installed (it is not available on Windows)
+    uvicorn.run(app, host="0.0.0.0", port=PORT, loop="auto", http="httptools", log_level="warning")
\ No newline at end of file
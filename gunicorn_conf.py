@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for running the FastAPI server with several worker processes:
+
+    gunicorn -c gunicorn_conf.py fastapi_server:app
+
+Workers do not share memory, so set REDIS_URL to give them a common project
+state and Gemini response cache. For local development `python fastapi_server.py`
+still starts a single uvicorn process.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8002)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 75
+
+# A client's MCP requests can land on any worker, so the streamable HTTP
+# transport must not keep sessions in process memory
+os.environ.setdefault("MCP_STATELESS_HTTP", "1")
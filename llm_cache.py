@@ -0,0 +1,111 @@
+"""
+Response cache for Gemini generations.
+
+Entries are keyed on the prompt, the generation settings and the model name, so
+changing any of them is a miss. They are kept in Redis when a client is given,
+on local disk when diskcache is installed, and in process memory otherwise.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from typing import Dict, Optional, Protocol
+
+import orjson
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+DEFAULT_TTL = 86400  # seconds
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".mcp_cache")
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+
+class MemoryBackend:
+    """Bounded in-process cache; the oldest entry is dropped when it is full"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: Dict[str, tuple] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+
+class DiskBackend:
+    """Persistent cache in a local directory, shared by the processes on one host"""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self._cache = diskcache.Cache(directory)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._cache.get, key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await asyncio.to_thread(self._cache.set, key, value, expire=ttl)
+
+
+class RedisBackend:
+    """Cache shared by every server that points at the same Redis"""
+
+    def __init__(self, client):
+        self._client = client
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._client.set(key, value, ex=ttl)
+
+
+def default_backend(redis_client=None) -> CacheBackend:
+    """Pick the most shared backend available"""
+    if redis_client is not None:
+        return RedisBackend(redis_client)
+    if diskcache is not None:
+        return DiskBackend()
+    return MemoryBackend()
+
+
+class LLMCache:
+    """Key builder, hit/miss counters and TTL around a CacheBackend"""
+
+    def __init__(self, backend: CacheBackend, ttl: int = DEFAULT_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(prompt: str, generation_config: Dict, model: str) -> str:
+        payload = orjson.dumps(
+            {
+                "p": prompt,
+                "cfg": dict(generation_config),
+                "model": model
+            },
+            option=orjson.OPT_SORT_KEYS
+        )
+        return "llm:" + hashlib.sha256(payload).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self.backend.get(key)
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        await self.backend.set(key, value, self.ttl)
@@ -1,14 +1,23 @@
-from mcp.server.fastmcp import FastMCP
-from tavily import TavilyClient
+from mcp.server.fastmcp import FastMCP, Context
+from tavily import AsyncTavilyClient
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, TypedDict
+import httpx
 import os
-import json
-import re
+import asyncio
+import contextlib
+import contextvars
+import functools
+import hashlib
+import orjson
+import time
+import uuid
 from datetime import datetime
-from enum import Enum
+from string import Template
 from pathlib import Path
-import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from llm_cache import LLMCache, default_backend
 
 # Load environment variables
 load_dotenv()
@@ -19,32 +28,121 @@ if "TAVILY_API_KEY" not in os.environ:
 
 # Initialize Tavily client
 TAVILY_API_KEY = os.environ["TAVILY_API_KEY"]
-tavily_client = TavilyClient(TAVILY_API_KEY)
-
-# Initialize Gemini
-GEMINI_AVAILABLE = False
-try:
-    import google.generativeai as genai
-    
-    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-    if GEMINI_API_KEY:
+tavily_client = AsyncTavilyClient(TAVILY_API_KEY)
+
+# Shared connection pool for Tavily requests. AsyncTavilyClient opens and closes a
+# fresh httpx client (new TCP/TLS handshake) on every search, so hand it this one instead.
+# Gemini's async gRPC channel is already created once per process by the SDK.
+# The headers and the TAVILY_HTTP_PROXY / TAVILY_HTTPS_PROXY mounts mirror what
+# AsyncTavilyClient builds for itself (tavily-python 0.7.x, pinned in pyproject.toml).
+_http_limits = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+_tavily_proxies = {
+    scheme: proxy
+    for scheme, proxy in (
+        ("http://", os.getenv("TAVILY_HTTP_PROXY")),
+        ("https://", os.getenv("TAVILY_HTTPS_PROXY"))
+    )
+    if proxy
+}
+http_client = httpx.AsyncClient(
+    base_url="https://api.tavily.com",
+    headers={
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {TAVILY_API_KEY}",
+        "X-Client-Source": "tavily-python"
+    },
+    mounts={
+        scheme: httpx.AsyncHTTPTransport(proxy=proxy, limits=_http_limits, http2=True)
+        for scheme, proxy in _tavily_proxies.items()
+    } or None,
+    limits=_http_limits,
+    timeout=60,
+    http2=True
+)
+if callable(getattr(tavily_client, "_client_creator", None)):
+    tavily_client._client_creator = lambda: contextlib.nullcontext(http_client)
+else:
+    print("⚠️  This tavily-python has no _client_creator; searches will not share connections")
+
+async def close_http_client():
+    """Close the shared HTTP connection pool"""
+    await http_client.aclose()
+
+# Initialize Gemini lazily: google.generativeai pulls in protobuf and grpc, so it is
+# imported on the first generation instead of delaying server start-up
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_AVAILABLE = bool(GEMINI_API_KEY)
+GEMINI_ERROR = None
+if not GEMINI_AVAILABLE:
+    print("⚠️  GEMINI_API_KEY not found in environment variables")
+
+@functools.lru_cache(maxsize=None)
+def _gemini():
+    """Import and configure the Gemini SDK once, returning the shared model"""
+    global GEMINI_AVAILABLE, GEMINI_ERROR
+    try:
+        import google.generativeai as genai
+        
         genai.configure(api_key=GEMINI_API_KEY)
-        gemini_model = genai.GenerativeModel('gemini-2.0-flash')
-        GEMINI_AVAILABLE = True
-        print("✅ Gemini initialized successfully")
-    else:
-        print("⚠️  GEMINI_API_KEY not found in environment variables")
-except Exception as e:
-    print(f"❌ Gemini initialization failed: {str(e)}")
-    GEMINI_ERROR = str(e)
+        model = genai.GenerativeModel(GEMINI_MODEL)
+    except Exception as e:
+        print(f"❌ Gemini initialization failed: {str(e)}")
+        GEMINI_AVAILABLE = False
+        GEMINI_ERROR = str(e)
+        raise
+    print("✅ Gemini initialized successfully")
+    return model
+
+# Generation settings per agent, shared by every call
+_CFG = {
+    "analyst": {"temperature": 0.5, "max_output_tokens": 8192},
+    "researcher": {"temperature": 0.4, "max_output_tokens": 8192},
+    "architect": {"temperature": 0.3, "max_output_tokens": 8192},
+    "lead": {"temperature": 0.3, "max_output_tokens": 8192},
+    "dev": {"temperature": 0.2, "max_output_tokens": 8192},
+    "qa": {"temperature": 0.2, "max_output_tokens": 8192},
+    "dev_batch": {"temperature": 0.2, "max_output_tokens": 8192, "response_mime_type": "application/json"},
+    "qa_batch": {"temperature": 0.2, "max_output_tokens": 8192, "response_mime_type": "application/json"},
+    "devops": {"temperature": 0.2, "max_output_tokens": 8192},
+    "docs": {"temperature": 0.3, "max_output_tokens": 8192},
+    "plan": {"temperature": 0.3, "max_output_tokens": 4096},
+    "summary": {"temperature": 0.4, "max_output_tokens": 4096},
+}
+
+# Optional Redis connection, shared by every server process that points at it
+REDIS_URL = os.environ.get("REDIS_URL")
+redis_client = None
+if REDIS_URL:
+    import redis.asyncio as aioredis
+    redis_client = aioredis.from_url(REDIS_URL, decode_responses=True)
 
 PORT = os.environ.get("PORT", 8000)
 
 # Create an MCP server
-mcp = FastMCP("ai-software-engineering-team", host="0.0.0.0", port=PORT)
-
-# Project state management (in-memory for this session)
-project_state = {
+mcp = FastMCP(
+    "ai-software-engineering-team",
+    host="0.0.0.0",
+    port=PORT,
+    # Multi-worker deployments (see gunicorn_conf.py) cannot keep MCP sessions per process
+    stateless_http=os.environ.get("MCP_STATELESS_HTTP") == "1"
+)
+
+# Project state management (in-memory for this session, mirrored to Redis
+# hashes when REDIS_URL is set so every worker process sees the same project)
+class ProjectState(TypedDict):
+    current_project: Optional[str]
+    requirements: Optional[str]
+    architecture: Optional[str]
+    tech_stack: Optional[str]
+    implementation_plan: Optional[str]
+    code_modules: Dict[str, str]
+    testing_results: Optional[str]
+    deployment_plan: Optional[str]
+
+
+# A project with nothing generated yet; give each copy its own code_modules dict
+_EMPTY_STATE: ProjectState = {
     "current_project": None,
     "requirements": None,
     "architecture": None,
@@ -55,39 +153,299 @@ project_state = {
     "deployment_plan": None
 }
 
+project_state: ProjectState = {**_EMPTY_STATE, "code_modules": {}}
+
+PROJECT_STATE_KEY = "project"
+CODE_MODULES_KEY = "project:code_modules"
+
+# Truncated project_state fields used as prompt context, shared by the agents
+# until the state next changes
+_context_cache: Dict[tuple, str] = {}
+
+
+def get_context_slice(key: str, limit: int, default: str) -> str:
+    """Return project_state[key], or default when it is unset or empty, cut to limit characters"""
+    cache_key = (key, limit, default)
+    text = _context_cache.get(cache_key)
+    if text is None:
+        text = _context_cache[cache_key] = (project_state.get(key) or default)[:limit]
+    return text
+
+
+async def refresh_project_state() -> None:
+    """Reload project_state from Redis (no-op without Redis)"""
+    if redis_client is None:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hgetall(PROJECT_STATE_KEY)
+        pipe.hgetall(CODE_MODULES_KEY)
+        fields, modules = await pipe.execute()
+    for key in project_state:
+        if key != "code_modules":
+            value = orjson.loads(fields[key]) if key in fields else None
+            if value != project_state[key]:
+                project_state[key] = value
+                _context_cache.clear()
+    project_state["code_modules"] = modules
+
+
+async def update_project_state(**fields) -> None:
+    """Set project state fields locally and, in one pipeline, in Redis"""
+    project_state.update(fields)
+    _context_cache.clear()
+    if redis_client is None:
+        return
+    modules = fields.pop("code_modules", None)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        if fields:
+            pipe.hset(PROJECT_STATE_KEY, mapping={k: orjson.dumps(v) for k, v in fields.items()})
+        if modules is not None:
+            pipe.delete(CODE_MODULES_KEY)
+            if modules:
+                pipe.hset(CODE_MODULES_KEY, mapping=modules)
+        await pipe.execute()
+
+
+async def start_project(user_request: str) -> None:
+    """Clear everything left from the previous project and record the new request"""
+    await update_project_state(**{**_EMPTY_STATE, "code_modules": {}, "current_project": user_request})
+
+
+async def save_code_module(module_name: str, code: str) -> None:
+    """Store one generated module without rewriting the others"""
+    project_state["code_modules"][module_name] = code
+    if redis_client is not None:
+        await redis_client.hset(CODE_MODULES_KEY, module_name, code)
+
+# Report banner and separators shared by the tools
+SEP = "=" * 80
+SEP_THIN = "─" * 80
+_BANNER = "\n{sep}\n{icon} {title}\n{sep}\n📅 Generated: {ts}\n👤 Agent: {agent}\n{details}\n{body}\n\n{sep}\n✅ {footer}\n{sep}\n"
+
+# Start time of the orchestrator or pipeline run in progress; the agents it runs
+# (including concurrently gathered ones, which copy the context) stamp their reports with it
+_run_timestamp: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("run_timestamp", default=None)
+
+
+def report_timestamp() -> str:
+    """Timestamp for a report header: the current run's start time, or now outside a run"""
+    return _run_timestamp.get() or datetime.now().isoformat(sep=' ', timespec='seconds')
+
+
+def with_run_timestamp(tool):
+    """Give every report produced during the wrapped tool call the call's start time"""
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        token = _run_timestamp.set(datetime.now().isoformat(sep=' ', timespec='seconds'))
+        try:
+            return await tool(*args, **kwargs)
+        finally:
+            _run_timestamp.reset(token)
+    return wrapper
+
 # =============================================================================
-# TEAM MEMBER 1: PRODUCT ANALYST
+# GEMINI REQUEST LIMITING & RESPONSE/SEARCH CACHES
 # =============================================================================
 
-@mcp.tool()
-def product_analyst(user_request: str, additional_context: str = "") -> str:
+# Receives each streamed chunk of text; returning True stops the generation early
+ChunkHandler = Callable[[str], Awaitable[Optional[bool]]]
+
+class GeminiLimiter:
     """
-    🎯 Product Analyst - Analyzes user requirements and creates detailed product specifications.
+    Caps how many Gemini requests are in flight at once.
     
-    This agent:
-    - Understands user needs and business goals
-    - Creates user stories and acceptance criteria
-    - Identifies core features and MVP scope
-    - Defines success metrics
+    generate_content has no multi-prompt endpoint, so every request is sent straight
+    away as its own concurrent call; past max_concurrent, callers wait for a free slot.
+    """
     
-    Args:
-        user_request: The user's application idea or requirements
-        additional_context: Any additional context or constraints
+    def __init__(self, max_concurrent: int = 8):
+        self.max_concurrent = max_concurrent
+        self._slots = asyncio.Semaphore(max_concurrent)
+    
+    async def submit(
+        self,
+        prompt: str,
+        generation_config,
+        on_chunk: Optional[ChunkHandler] = None
+    ) -> str:
+        """Generate text for a prompt once a slot is free"""
+        async with self._slots:
+            response = await _gemini().generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=on_chunk is not None
+            )
+            if on_chunk is None:
+                return response.text
+            
+            parts = []
+            async for chunk in response:
+                if chunk.parts:
+                    parts.append(chunk.text)
+                    if await on_chunk(chunk.text):
+                        break  # the caller has everything it needs
+            return "".join(parts)
+
+gemini_limiter = GeminiLimiter()
+
+llm_cache = LLMCache(default_backend(redis_client), ttl=86400)
+
+async def cached_generate(
+    prompt: str,
+    generation_config: Dict,
+    on_chunk: Optional[ChunkHandler] = None,
+    enabled: bool = True
+) -> str:
+    """
+    Generate text with Gemini, reusing the stored response for an identical prompt and config.
     
-    Returns:
-        Detailed product analysis and requirements document
+    Responses are kept in Redis when REDIS_URL is set, on disk when diskcache is
+    installed, otherwise in process memory (see llm_cache.py). Pass enabled=False
+    to always call Gemini. When on_chunk is given, a fresh generation is streamed
+    and each chunk of text is passed to it as soon as Gemini produces it; if it
+    returns True the rest of the generation is skipped.
     """
-    if not GEMINI_AVAILABLE:
-        return "❌ Product Analyst requires Gemini AI"
+    if not enabled:
+        return await gemini_limiter.submit(prompt, generation_config, on_chunk)
+    
+    key = llm_cache.key(prompt, generation_config, GEMINI_MODEL)
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        return cached
     
-    analyst_prompt = f"""
+    text = await gemini_limiter.submit(prompt, generation_config, on_chunk)
+    await llm_cache.set(key, text)
+    return text
+
+SEARCH_CACHE_TTL = 3600  # seconds
+SEARCH_CACHE_MAX_ENTRIES = 512
+_search_cache: Dict[str, tuple] = {}
+
+async def cached_search(query: str, max_results: int = 5) -> Dict:
+    """
+    Run a Tavily search, reusing the stored response for the same query within the TTL.
+    
+    Like cached_generate, responses are kept in Redis when REDIS_URL is set,
+    otherwise in process memory.
+    """
+    key = "search:" + hashlib.sha256(f"{max_results}:{query}".encode()).hexdigest()
+    
+    if redis_client is not None:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    else:
+        entry = _search_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+    
+    response = await tavily_client.search(query, max_results=max_results)
+    
+    if redis_client is not None:
+        await redis_client.set(key, orjson.dumps(response, default=str), ex=SEARCH_CACHE_TTL)
+    else:
+        if len(_search_cache) >= SEARCH_CACHE_MAX_ENTRIES:
+            _search_cache.pop(next(iter(_search_cache)))  # drop the oldest entry
+        _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, response)
+    
+    return response
+
+def stream_to_client(ctx: Optional[Context], agent: str) -> Optional[Callable[[str], Awaitable[None]]]:
+    """Forward generated text to the MCP client as log notifications while a tool runs"""
+    if ctx is None:
+        return None
+    
+    async def send(text: str) -> None:
+        await ctx.info(text, logger_name=agent)
+    
+    return send
+
+class JsonObjectTracker:
+    """Follows brace depth across streamed text, ignoring braces inside JSON strings"""
+    
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, text: str) -> int:
+        """Consume more text; return the offset just past the closing brace, or -1 if still open"""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.started
+            elif ch == '{':
+                self.depth += 1
+                self.started = True
+            elif ch == '}' and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+def extract_json(text: str) -> Optional[str]:
+    """Return the first complete top-level JSON object in text, found in a single pass"""
+    end = JsonObjectTracker().feed(text)
+    if end < 0:
+        return None
+    return text[text.index('{'):end]
+
+def parse_module_map(text: str, module_names: List[str]) -> Dict[str, str]:
+    """Read a {module_name: content} JSON reply, keeping only the requested, non-empty modules"""
+    json_text = extract_json(text)
+    if json_text is None:
+        return {}
+    try:
+        data = orjson.loads(json_text)
+    except orjson.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        name: data[name]
+        for name in module_names
+        if isinstance(data.get(name), str) and data[name].strip()
+    }
+
+def split_module_specs(modules: List[Dict], fields: tuple) -> tuple:
+    """
+    Split batch modules into ({module_name: first spec}, [leftover specs]).
+    
+    Entries that aren't mappings or set none of the given fields are skipped.
+    A later spec that repeats a module name with different parameters is a leftover,
+    to be handled on its own after the batch rather than dropped; exact repeats are merged.
+    """
+    specs = {}
+    extras = []
+    for module in modules or []:
+        if not isinstance(module, dict) or not any(module.get(field) for field in fields):
+            continue
+        name = module.get('module_name', 'main_module')
+        if name not in specs:
+            specs[name] = module
+        elif module != specs[name] and module not in extras:
+            extras.append(module)
+    return specs, extras
+
+# =============================================================================
+# TEAM MEMBER 1: PRODUCT ANALYST
+# =============================================================================
+
+PRODUCT_ANALYST_PROMPT = Template("""
     You are an expert Product Analyst on an AI software engineering team.
     
     USER REQUEST:
-    {user_request}
+    $user_request
     
     ADDITIONAL CONTEXT:
-    {additional_context if additional_context else "None provided"}
+    $additional_context
     
     Analyze this request and create a comprehensive product specification:
     
@@ -125,34 +483,54 @@ def product_analyst(user_request: str, additional_context: str = "") -> str:
        - Assumptions we're making
     
     Be specific, practical, and developer-friendly in your analysis.
+    """)
+
+@mcp.tool()
+async def product_analyst(user_request: str, additional_context: str = "", ctx: Context = None) -> str:
+    """
+    🎯 Product Analyst - Analyzes user requirements and creates detailed product specifications.
+    
+    This agent:
+    - Understands user needs and business goals
+    - Creates user stories and acceptance criteria
+    - Identifies core features and MVP scope
+    - Defines success metrics
+    
+    Args:
+        user_request: The user's application idea or requirements
+        additional_context: Any additional context or constraints
+    
+    Returns:
+        Detailed product analysis and requirements document
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ Product Analyst requires Gemini AI"
+    
+    analyst_prompt = PRODUCT_ANALYST_PROMPT.substitute(
+        user_request=user_request,
+        additional_context=additional_context if additional_context else "None provided"
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             analyst_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.5,
-                max_output_tokens=8192,
-            )
+            _CFG["analyst"],
+            stream_to_client(ctx, "product_analyst")
         )
         
-        result = f"""
-{'='*80}
-🎯 PRODUCT ANALYST REPORT
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: Product Analyst AI
-
-{response.text}
-
-{'='*80}
-✅ Analysis Complete - Ready for Architecture Team
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="🎯",
+            title="PRODUCT ANALYST REPORT",
+            ts=report_timestamp(),
+            agent="Product Analyst AI",
+            details="",
+            body=response_text,
+            footer="Analysis Complete - Ready for Architecture Team"
+        )
         
         # Update project state
-        project_state["requirements"] = response.text
-        project_state["current_project"] = user_request
+        await update_project_state(requirements=response_text, current_project=user_request)
         
         return result
         
@@ -163,54 +541,13 @@ def product_analyst(user_request: str, additional_context: str = "") -> str:
 # TEAM MEMBER 2: RESEARCH ENGINEER
 # =============================================================================
 
-@mcp.tool()
-def research_engineer(topic: str, focus_areas: List[str] = None) -> str:
-    """
-    🔍 Research Engineer - Searches the web for best practices, technologies, and solutions.
-    
-    This agent:
-    - Researches current best practices
-    - Finds relevant libraries and frameworks
-    - Discovers similar projects and case studies
-    - Identifies potential technical challenges and solutions
-    
-    Args:
-        topic: What to research (e.g., "real-time chat applications")
-        focus_areas: Specific aspects to focus on (e.g., ["scalability", "security"])
-    
-    Returns:
-        Comprehensive research report with recommendations
-    """
-    if not GEMINI_AVAILABLE:
-        return "❌ Research Engineer requires Gemini AI"
+RESEARCH_ENGINEER_PROMPT = Template("""
+    You are an expert Research Engineer analyzing technical resources for: $topic
     
-    # Perform multiple targeted searches
-    search_queries = [
-        f"{topic} best practices 2024 2025",
-        f"{topic} architecture patterns",
-        f"{topic} technology stack recommendations"
-    ]
-    
-    if focus_areas:
-        for area in focus_areas[:2]:  # Limit to 2 additional searches
-            search_queries.append(f"{topic} {area} solutions")
-    
-    all_results = []
-    for query in search_queries[:4]:  # Max 4 searches
-        try:
-            response = tavily_client.search(query, max_results=5)
-            all_results.extend(response.get("results", []))
-        except Exception as e:
-            print(f"Search error for '{query}': {str(e)}")
-    
-    # Synthesize research findings with Gemini
-    research_prompt = f"""
-    You are an expert Research Engineer analyzing technical resources for: {topic}
-    
-    FOCUS AREAS: {', '.join(focus_areas) if focus_areas else 'General best practices'}
+    FOCUS AREAS: $focus_areas
     
     RESEARCH DATA:
-    {json.dumps(all_results, indent=2, default=str)[:12000]}
+    $research_data
     
     Create a comprehensive research report:
     
@@ -248,32 +585,90 @@ def research_engineer(topic: str, focus_areas: List[str] = None) -> str:
        - Emerging technologies relevant to this project
     
     Be specific with technology versions and practical implementation advice.
+    """)
+
+@mcp.tool()
+async def research_engineer(topic: str, focus_areas: List[str] = None, ctx: Context = None) -> str:
+    """
+    🔍 Research Engineer - Searches the web for best practices, technologies, and solutions.
+    
+    This agent:
+    - Researches current best practices
+    - Finds relevant libraries and frameworks
+    - Discovers similar projects and case studies
+    - Identifies potential technical challenges and solutions
+    
+    Args:
+        topic: What to research (e.g., "real-time chat applications")
+        focus_areas: Specific aspects to focus on (e.g., ["scalability", "security"])
+    
+    Returns:
+        Comprehensive research report with recommendations
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ Research Engineer requires Gemini AI"
+    
+    # Perform multiple targeted searches
+    search_queries = [
+        f"{topic} best practices 2024 2025",
+        f"{topic} architecture patterns",
+        f"{topic} technology stack recommendations"
+    ]
+    
+    if focus_areas:
+        for area in focus_areas[:2]:  # Limit to 2 additional searches
+            search_queries.append(f"{topic} {area} solutions")
+    
+    # Run the searches concurrently so the total wait is the slowest query, not the sum
+    queries = list(dict.fromkeys(search_queries))[:4]  # Max 4 distinct searches
+    responses = await asyncio.gather(
+        *[cached_search(query, max_results=5) for query in queries],
+        return_exceptions=True
+    )
+    
+    all_results = []
+    for query, response in zip(queries, responses):
+        if isinstance(response, Exception):
+            print(f"Search error for '{query}': {str(response)}")
+            continue
+        all_results.extend(response.get("results", []))
+    
+    # Serialize results compactly, stopping at the prompt budget instead of
+    # pretty-printing everything and slicing most of it away
+    research_parts = []
+    research_size = 0
+    for item in all_results:
+        chunk = orjson.dumps(item, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        if research_size + len(chunk) > 12000:
+            break
+        research_parts.append(chunk)
+        research_size += len(chunk) + 1
+    research_json = "[" + ",".join(research_parts) + "]"
+    
+    # Synthesize research findings with Gemini
+    research_prompt = RESEARCH_ENGINEER_PROMPT.substitute(
+        topic=topic,
+        focus_areas=', '.join(focus_areas) if focus_areas else 'General best practices',
+        research_data=research_json
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             research_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.4,
-                max_output_tokens=8192,
-            )
+            _CFG["researcher"],
+            stream_to_client(ctx, "research_engineer")
         )
         
-        result = f"""
-{'='*80}
-🔍 RESEARCH ENGINEER REPORT
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: Research Engineer AI
-🔎 Searches Performed: {len(search_queries)}
-📊 Sources Analyzed: {len(all_results)}
-
-{response.text}
-
-{'='*80}
-✅ Research Complete - Ready for Architecture Design
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="🔍",
+            title="RESEARCH ENGINEER REPORT",
+            ts=report_timestamp(),
+            agent="Research Engineer AI",
+            details=f"🔎 Searches Performed: {len(queries)}\n📊 Sources Analyzed: {len(all_results)}\n",
+            body=response_text,
+            footer="Research Complete - Ready for Architecture Design"
+        )
         
         return result
         
@@ -284,40 +679,14 @@ def research_engineer(topic: str, focus_areas: List[str] = None) -> str:
 # TEAM MEMBER 3: SOFTWARE ARCHITECT
 # =============================================================================
 
-@mcp.tool()
-def software_architect(requirements: str = None, research_findings: str = None) -> str:
-    """
-    🏗️ Software Architect - Designs system architecture and technical specifications.
-    
-    This agent:
-    - Creates system architecture diagrams (described textually)
-    - Defines data models and schemas
-    - Plans API endpoints and interfaces
-    - Specifies technology stack
-    - Creates technical documentation
-    
-    Args:
-        requirements: Product requirements (uses project state if not provided)
-        research_findings: Research report (optional context)
-    
-    Returns:
-        Detailed architecture design document
-    """
-    if not GEMINI_AVAILABLE:
-        return "❌ Software Architect requires Gemini AI"
-    
-    # Use project state if not provided
-    if not requirements:
-        requirements = project_state.get("requirements", "No requirements available")
-    
-    architect_prompt = f"""
+SOFTWARE_ARCHITECT_PROMPT = Template("""
     You are an expert Software Architect designing a robust, scalable system.
     
     REQUIREMENTS:
-    {requirements}
+    $requirements
     
     RESEARCH CONTEXT:
-    {research_findings if research_findings else "Use your expertise for technology choices"}
+    $research_findings
     
     Create a comprehensive architecture design:
     
@@ -385,33 +754,61 @@ def software_architect(requirements: str = None, research_findings: str = None)
        - Development setup steps
     
     Be extremely specific and implementation-ready.
+    """)
+
+@mcp.tool()
+async def software_architect(requirements: str = None, research_findings: str = None, ctx: Context = None) -> str:
+    """
+    🏗️ Software Architect - Designs system architecture and technical specifications.
+    
+    This agent:
+    - Creates system architecture diagrams (described textually)
+    - Defines data models and schemas
+    - Plans API endpoints and interfaces
+    - Specifies technology stack
+    - Creates technical documentation
+    
+    Args:
+        requirements: Product requirements (uses project state if not provided)
+        research_findings: Research report (optional context)
+    
+    Returns:
+        Detailed architecture design document
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ Software Architect requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    # Use project state if not provided
+    if not requirements:
+        requirements = project_state.get("requirements") or "No requirements available"
+    
+    architect_prompt = SOFTWARE_ARCHITECT_PROMPT.substitute(
+        requirements=requirements,
+        research_findings=research_findings if research_findings else "Use your expertise for technology choices"
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             architect_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=8192,
-            )
+            _CFG["architect"],
+            stream_to_client(ctx, "software_architect")
         )
         
-        result = f"""
-{'='*80}
-🏗️ SOFTWARE ARCHITECT DESIGN DOCUMENT
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: Software Architect AI
-
-{response.text}
-
-{'='*80}
-✅ Architecture Complete - Ready for Implementation Planning
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="🏗️",
+            title="SOFTWARE ARCHITECT DESIGN DOCUMENT",
+            ts=report_timestamp(),
+            agent="Software Architect AI",
+            details="",
+            body=response_text,
+            footer="Architecture Complete - Ready for Implementation Planning"
+        )
         
         # Update project state
-        project_state["architecture"] = response.text
+        await update_project_state(architecture=response_text)
         
         return result
         
@@ -422,36 +819,11 @@ def software_architect(requirements: str = None, research_findings: str = None)
 # TEAM MEMBER 4: TECHNICAL LEAD
 # =============================================================================
 
-@mcp.tool()
-def technical_lead(architecture: str = None) -> str:
-    """
-    📋 Technical Lead - Creates detailed implementation plan and task breakdown.
-    
-    This agent:
-    - Breaks down architecture into implementable tasks
-    - Defines development phases and milestones
-    - Estimates effort for each task
-    - Creates sprint planning
-    - Identifies dependencies
-    
-    Args:
-        architecture: Architecture document (uses project state if not provided)
-    
-    Returns:
-        Detailed implementation plan with task breakdown
-    """
-    if not GEMINI_AVAILABLE:
-        return "❌ Technical Lead requires Gemini AI"
-    
-    # Use project state if not provided
-    if not architecture:
-        architecture = project_state.get("architecture", "No architecture available")
-    
-    lead_prompt = f"""
+TECHNICAL_LEAD_PROMPT = Template("""
     You are an expert Technical Lead creating an implementation plan.
     
     ARCHITECTURE:
-    {architecture}
+    $architecture
     
     Create a detailed implementation plan:
     
@@ -508,33 +880,59 @@ def technical_lead(architecture: str = None) -> str:
        - Git workflow
     
     Be extremely detailed and actionable. Each task should be clear enough for a developer to start immediately.
+    """)
+
+@mcp.tool()
+async def technical_lead(architecture: str = None, ctx: Context = None) -> str:
     """
+    📋 Technical Lead - Creates detailed implementation plan and task breakdown.
+    
+    This agent:
+    - Breaks down architecture into implementable tasks
+    - Defines development phases and milestones
+    - Estimates effort for each task
+    - Creates sprint planning
+    - Identifies dependencies
+    
+    Args:
+        architecture: Architecture document (uses project state if not provided)
+    
+    Returns:
+        Detailed implementation plan with task breakdown
+    """
+    if not GEMINI_AVAILABLE:
+        return "❌ Technical Lead requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    # Use project state if not provided
+    if not architecture:
+        architecture = project_state.get("architecture") or "No architecture available"
+    
+    lead_prompt = TECHNICAL_LEAD_PROMPT.substitute(
+        architecture=architecture
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             lead_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=8192,
-            )
+            _CFG["lead"],
+            stream_to_client(ctx, "technical_lead")
+        )
+        
+        result = _BANNER.format(
+            sep=SEP,
+            icon="📋",
+            title="TECHNICAL LEAD IMPLEMENTATION PLAN",
+            ts=report_timestamp(),
+            agent="Technical Lead AI",
+            details="",
+            body=response_text,
+            footer="Implementation Plan Complete - Ready for Development"
         )
         
-        result = f"""
-{'='*80}
-📋 TECHNICAL LEAD IMPLEMENTATION PLAN
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: Technical Lead AI
-
-{response.text}
-
-{'='*80}
-✅ Implementation Plan Complete - Ready for Development
-{'='*80}
-"""
-        
         # Update project state
-        project_state["implementation_plan"] = response.text
+        await update_project_state(implementation_plan=response_text)
         
         return result
         
@@ -545,40 +943,17 @@ def technical_lead(architecture: str = None) -> str:
 # TEAM MEMBER 5: SENIOR DEVELOPER
 # =============================================================================
 
-@mcp.tool()
-def senior_developer(module_name: str, specifications: str, language: str = "python") -> str:
-    """
-    💻 Senior Developer - Writes production-ready code for specific modules.
-    
-    This agent:
-    - Implements features according to specifications
-    - Writes clean, maintainable code
-    - Includes error handling and logging
-    - Adds inline documentation
-    - Follows best practices
-    
-    Args:
-        module_name: Name of the module to implement
-        specifications: Detailed specifications for this module
-        language: Programming language (python, javascript, typescript, etc.)
-    
-    Returns:
-        Production-ready code with documentation
-    """
-    if not GEMINI_AVAILABLE:
-        return "❌ Senior Developer requires Gemini AI"
-    
-    developer_prompt = f"""
+SENIOR_DEVELOPER_PROMPT = Template("""
     You are an expert Senior Developer implementing a production-ready module.
     
-    MODULE: {module_name}
-    LANGUAGE: {language}
+    MODULE: $module_name
+    LANGUAGE: $language
     
     SPECIFICATIONS:
-    {specifications}
+    $specifications
     
     PROJECT CONTEXT:
-    Architecture: {project_state.get('architecture', 'See specifications')[:1000]}
+    Architecture: $architecture
     
     Write production-ready code with:
     
@@ -619,84 +994,183 @@ def senior_developer(module_name: str, specifications: str, language: str = "pyt
        - Known limitations
     
     Provide complete, runnable code with all necessary imports and setup.
+    """)
+
+@mcp.tool()
+async def senior_developer(module_name: str, specifications: str, language: str = "python", ctx: Context = None) -> str:
+    """
+    💻 Senior Developer - Writes production-ready code for specific modules.
+    
+    This agent:
+    - Implements features according to specifications
+    - Writes clean, maintainable code
+    - Includes error handling and logging
+    - Adds inline documentation
+    - Follows best practices
+    
+    Args:
+        module_name: Name of the module to implement
+        specifications: Detailed specifications for this module
+        language: Programming language (python, javascript, typescript, etc.)
+    
+    Returns:
+        Production-ready code with documentation
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ Senior Developer requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    developer_prompt = SENIOR_DEVELOPER_PROMPT.substitute(
+        module_name=module_name,
+        language=language,
+        specifications=specifications,
+        architecture=get_context_slice('architecture', 1000, 'See specifications')
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             developer_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.2,
-                max_output_tokens=8192,
-            )
+            _CFG["dev"],
+            stream_to_client(ctx, "senior_developer")
         )
         
-        result = f"""
-{'='*80}
-💻 SENIOR DEVELOPER - MODULE IMPLEMENTATION
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: Senior Developer AI
-📦 Module: {module_name}
-🔤 Language: {language}
-
-{response.text}
-
-{'='*80}
-✅ Module Implementation Complete - Ready for Review & Testing
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="💻",
+            title="SENIOR DEVELOPER - MODULE IMPLEMENTATION",
+            ts=report_timestamp(),
+            agent="Senior Developer AI",
+            details=f"📦 Module: {module_name}\n🔤 Language: {language}\n",
+            body=response_text,
+            footer="Module Implementation Complete - Ready for Review & Testing"
+        )
         
         # Store in project state
-        if "code_modules" not in project_state:
-            project_state["code_modules"] = {}
-        project_state["code_modules"][module_name] = response.text
+        await save_code_module(module_name, response_text)
         
         return result
         
     except Exception as e:
         return f"❌ Senior Developer Error: {str(e)}"
 
-# =============================================================================
-# TEAM MEMBER 6: QA ENGINEER
-# =============================================================================
+SENIOR_DEVELOPER_BATCH_PROMPT = Template("""
+    You are an expert Senior Developer implementing several production-ready modules at once.
+    
+    PROJECT CONTEXT:
+    Architecture: $architecture
+    
+    MODULES:
+    $modules
+    
+    For every module write production-ready code with module documentation, a clean
+    implementation (error handling, input validation, logging, type hints), 2-3 key
+    unit test examples, the configuration it needs and short code review notes.
+    Provide complete, runnable code with all necessary imports and setup.
+    
+    Respond with a single JSON object that maps each module name ($module_names)
+    to that module's complete deliverable as a markdown string. Return no other text.
+    """)
 
 @mcp.tool()
-def qa_engineer(module_name: str, code: str = None, test_type: str = "comprehensive") -> str:
+async def senior_developer_batch(modules: List[Dict], language: str = "python", ctx: Context = None) -> str:
     """
-    🧪 QA Engineer - Creates comprehensive test suites and quality assurance plans.
+    💻 Senior Developer (batch) - Implements several modules with a single request.
     
-    This agent:
-    - Writes unit tests
-    - Creates integration tests
-    - Designs test scenarios
-    - Identifies edge cases
-    - Creates test automation scripts
+    Modules missing from the combined response, and further specs for a module
+    name already in the batch, are implemented one at a time with senior_developer.
     
     Args:
-        module_name: Name of module to test
-        code: The code to test (uses project state if not provided)
-        test_type: Type of testing (unit, integration, e2e, comprehensive)
+        modules: Modules to implement, each {"module_name": ..., "specifications": ..., "language": ...}
+        language: Programming language for modules that don't name one
     
     Returns:
-        Complete test suite with multiple test scenarios
+        Production-ready code with documentation for every module
     """
     if not GEMINI_AVAILABLE:
-        return "❌ QA Engineer requires Gemini AI"
+        return "❌ Senior Developer requires Gemini AI"
     
-    # Try to get code from project state if not provided
-    if not code:
-        code = project_state.get("code_modules", {}).get(module_name, "No code available")
+    await refresh_project_state()
+    
+    specs, extras = split_module_specs(modules, ('module_name', 'specifications'))
+    if not specs:
+        return "❌ No modules given - each entry needs a module_name or specifications"
+    module_names = list(specs)
+    
+    developer_prompt = SENIOR_DEVELOPER_BATCH_PROMPT.substitute(
+        architecture=get_context_slice('architecture', 1000, 'See specifications'),
+        modules="\n\n".join(
+            f"MODULE: {name}\nLANGUAGE: {module.get('language', language)}\n"
+            f"SPECIFICATIONS:\n{module.get('specifications', 'Implement according to architecture')}"
+            for name, module in specs.items()
+        ),
+        module_names=", ".join(module_names)
+    )
+    
+    try:
+        response_text = await cached_generate(developer_prompt, _CFG["dev_batch"])
+        implementations = parse_module_map(response_text, module_names)
+    except Exception as e:
+        print(f"⚠️ Batched implementation failed, falling back to single modules: {str(e)}")
+        implementations = {}
+    
+    for name, code in implementations.items():
+        await save_code_module(name, code)
+    
+    reports = []
+    if implementations:
+        reports.append(_BANNER.format(
+            sep=SEP,
+            icon="💻",
+            title="SENIOR DEVELOPER - BATCH MODULE IMPLEMENTATION",
+            ts=report_timestamp(),
+            agent="Senior Developer AI",
+            details="📦 Modules: " + ", ".join(
+                f"{name} ({specs[name].get('language', language)})" for name in implementations
+            ) + "\n",
+            body="\n\n".join(f"📦 MODULE: {name}\n\n{code}" for name, code in implementations.items()),
+            footer="Module Implementations Complete - Ready for Review & Testing"
+        ))
+    
+    # Anything the combined response didn't cover goes through the single-module tool
+    reports.extend(await asyncio.gather(*[
+        senior_developer(
+            name,
+            module.get('specifications', 'Implement according to architecture'),
+            module.get('language', language),
+            ctx
+        )
+        for name, module in specs.items()
+        if name not in implementations
+    ]))
+    
+    # Further specs for an already batched module run afterwards, so they are applied last
+    reports.extend(await asyncio.gather(*[
+        senior_developer(
+            module.get('module_name', 'main_module'),
+            module.get('specifications', 'Implement according to architecture'),
+            module.get('language', language),
+            ctx
+        )
+        for module in extras
+    ]))
     
-    qa_prompt = f"""
-    You are an expert QA Engineer creating comprehensive tests for: {module_name}
+    return "".join(reports)
+
+# =============================================================================
+# TEAM MEMBER 6: QA ENGINEER
+# =============================================================================
+
+QA_ENGINEER_PROMPT = Template("""
+    You are an expert QA Engineer creating comprehensive tests for: $module_name
     
-    TEST TYPE: {test_type}
+    TEST TYPE: $test_type
     
     CODE TO TEST:
-    {code[:6000]}
+    $code
     
     PROJECT CONTEXT:
-    {project_state.get('architecture', 'No architecture available')[:1000]}
+    $architecture
     
     Create a comprehensive testing strategy:
     
@@ -758,72 +1232,170 @@ def qa_engineer(module_name: str, code: str = None, test_type: str = "comprehens
         - Quality gates
     
     Provide complete, runnable test code using appropriate testing framework.
+    """)
+
+@mcp.tool()
+async def qa_engineer(module_name: str, code: str = None, test_type: str = "comprehensive", ctx: Context = None) -> str:
+    """
+    🧪 QA Engineer - Creates comprehensive test suites and quality assurance plans.
+    
+    This agent:
+    - Writes unit tests
+    - Creates integration tests
+    - Designs test scenarios
+    - Identifies edge cases
+    - Creates test automation scripts
+    
+    Args:
+        module_name: Name of module to test
+        code: The code to test (uses project state if not provided)
+        test_type: Type of testing (unit, integration, e2e, comprehensive)
+    
+    Returns:
+        Complete test suite with multiple test scenarios
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ QA Engineer requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    # Try to get code from project state if not provided
+    if not code:
+        code = project_state["code_modules"].get(module_name) or "No code available"
+    
+    qa_prompt = QA_ENGINEER_PROMPT.substitute(
+        module_name=module_name,
+        test_type=test_type,
+        code=code[:6000],
+        architecture=get_context_slice('architecture', 1000, 'No architecture available')
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             qa_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.2,
-                max_output_tokens=8192,
-            )
+            _CFG["qa"],
+            stream_to_client(ctx, "qa_engineer")
         )
         
-        result = f"""
-{'='*80}
-🧪 QA ENGINEER - TEST SUITE
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: QA Engineer AI
-📦 Module: {module_name}
-🎯 Test Type: {test_type}
-
-{response.text}
-
-{'='*80}
-✅ Test Suite Complete - Ready for Execution
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="🧪",
+            title="QA ENGINEER - TEST SUITE",
+            ts=report_timestamp(),
+            agent="QA Engineer AI",
+            details=f"📦 Module: {module_name}\n🎯 Test Type: {test_type}\n",
+            body=response_text,
+            footer="Test Suite Complete - Ready for Execution"
+        )
         
         return result
         
     except Exception as e:
         return f"❌ QA Engineer Error: {str(e)}"
 
-# =============================================================================
-# TEAM MEMBER 7: DEVOPS ENGINEER
-# =============================================================================
+QA_ENGINEER_BATCH_PROMPT = Template("""
+    You are an expert QA Engineer creating comprehensive tests for several modules at once.
+    
+    PROJECT CONTEXT:
+    $architecture
+    
+    MODULES TO TEST:
+    $modules
+    
+    For every module create a testing strategy with a test plan overview, at least 10
+    unit tests and 5 integration scenarios with complete test code, the edge cases to
+    cover, and the test data and fixtures it needs.
+    
+    Respond with a single JSON object that maps each module name ($module_names)
+    to that module's complete test suite as a markdown string. Return no other text.
+    """)
 
 @mcp.tool()
-def devops_engineer(environment: str = "production", deployment_type: str = "cloud") -> str:
+async def qa_engineer_batch(modules: List[Dict], test_type: str = "comprehensive", ctx: Context = None) -> str:
     """
-    🚀 DevOps Engineer - Creates deployment configurations and CI/CD pipelines.
+    🧪 QA Engineer (batch) - Creates test suites for several modules with a single request.
     
-    This agent:
-    - Creates Docker configurations
-    - Designs CI/CD pipelines
-    - Configures infrastructure as code
-    - Sets up monitoring and logging
-    - Creates deployment documentation
+    Modules missing from the combined response, and further specs for a module
+    name already in the batch, are tested one at a time with qa_engineer.
     
     Args:
-        environment: Target environment (development, staging, production)
-        deployment_type: Type of deployment (cloud, on-premise, serverless)
+        modules: Modules to test, each {"module_name": ..., "code": ..., "test_type": ...}; code
+            defaults to the implementation stored in the project state
+        test_type: Type of testing for modules that don't name one
     
     Returns:
-        Complete deployment and infrastructure configuration
+        Test suite for every module
     """
     if not GEMINI_AVAILABLE:
-        return "❌ DevOps Engineer requires Gemini AI"
+        return "❌ QA Engineer requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    specs, extras = split_module_specs(modules, ('module_name', 'code'))
+    if not specs:
+        return "❌ No modules given - each entry needs a module_name or code"
+    module_names = list(specs)
+    code_modules = project_state.get("code_modules", {})
+    
+    qa_prompt = QA_ENGINEER_BATCH_PROMPT.substitute(
+        architecture=get_context_slice('architecture', 1000, 'No architecture available'),
+        modules="\n\n".join(
+            f"MODULE: {name}\nTEST TYPE: {module.get('test_type', test_type)}\n"
+            f"CODE TO TEST:\n{(module.get('code') or code_modules.get(name, 'No code available'))[:6000]}"
+            for name, module in specs.items()
+        ),
+        module_names=", ".join(module_names)
+    )
     
-    devops_prompt = f"""
+    try:
+        response_text = await cached_generate(qa_prompt, _CFG["qa_batch"])
+        suites = parse_module_map(response_text, module_names)
+    except Exception as e:
+        print(f"⚠️ Batched testing failed, falling back to single modules: {str(e)}")
+        suites = {}
+    
+    reports = []
+    if suites:
+        reports.append(_BANNER.format(
+            sep=SEP,
+            icon="🧪",
+            title="QA ENGINEER - BATCH TEST SUITES",
+            ts=report_timestamp(),
+            agent="QA Engineer AI",
+            details="📦 Modules: " + ", ".join(
+                f"{name} ({specs[name].get('test_type', test_type)})" for name in suites
+            ) + "\n",
+            body="\n\n".join(f"📦 MODULE: {name}\n\n{suite}" for name, suite in suites.items()),
+            footer="Test Suites Complete - Ready for Execution"
+        ))
+    
+    # Anything the combined response didn't cover goes through the single-module tool
+    reports.extend(await asyncio.gather(*[
+        qa_engineer(name, module.get('code'), module.get('test_type', test_type), ctx)
+        for name, module in specs.items()
+        if name not in suites
+    ]))
+    
+    # Further specs for an already batched module run afterwards, so they are applied last
+    reports.extend(await asyncio.gather(*[
+        qa_engineer(module.get('module_name', 'main_module'), module.get('code'), module.get('test_type', test_type), ctx)
+        for module in extras
+    ]))
+    
+    return "".join(reports)
+
+# =============================================================================
+# TEAM MEMBER 7: DEVOPS ENGINEER
+# =============================================================================
+
+DEVOPS_ENGINEER_PROMPT = Template("""
     You are an expert DevOps Engineer setting up deployment infrastructure.
     
-    ENVIRONMENT: {environment}
-    DEPLOYMENT TYPE: {deployment_type}
+    ENVIRONMENT: $environment
+    DEPLOYMENT TYPE: $deployment_type
     
     PROJECT CONTEXT:
-    Architecture: {project_state.get('architecture', 'No architecture available')[:2000]}
+    Architecture: $architecture
     
     Create a comprehensive deployment strategy:
     
@@ -896,35 +1468,58 @@ def devops_engineer(environment: str = "production", deployment_type: str = "clo
         - Runbook for common operations
     
     Provide complete, copy-paste ready configuration files.
+    """)
+
+@mcp.tool()
+async def devops_engineer(environment: str = "production", deployment_type: str = "cloud", ctx: Context = None) -> str:
+    """
+    🚀 DevOps Engineer - Creates deployment configurations and CI/CD pipelines.
+    
+    This agent:
+    - Creates Docker configurations
+    - Designs CI/CD pipelines
+    - Configures infrastructure as code
+    - Sets up monitoring and logging
+    - Creates deployment documentation
+    
+    Args:
+        environment: Target environment (development, staging, production)
+        deployment_type: Type of deployment (cloud, on-premise, serverless)
+    
+    Returns:
+        Complete deployment and infrastructure configuration
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ DevOps Engineer requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    devops_prompt = DEVOPS_ENGINEER_PROMPT.substitute(
+        environment=environment,
+        deployment_type=deployment_type,
+        architecture=get_context_slice('architecture', 2000, 'No architecture available')
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             devops_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.2,
-                max_output_tokens=8192,
-            )
+            _CFG["devops"],
+            stream_to_client(ctx, "devops_engineer")
         )
         
-        result = f"""
-{'='*80}
-🚀 DEVOPS ENGINEER - DEPLOYMENT CONFIGURATION
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: DevOps Engineer AI
-🌍 Environment: {environment}
-☁️ Deployment Type: {deployment_type}
-
-{response.text}
-
-{'='*80}
-✅ Deployment Configuration Complete - Ready for Deployment
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="🚀",
+            title="DEVOPS ENGINEER - DEPLOYMENT CONFIGURATION",
+            ts=report_timestamp(),
+            agent="DevOps Engineer AI",
+            details=f"🌍 Environment: {environment}\n☁️ Deployment Type: {deployment_type}\n",
+            body=response_text,
+            footer="Deployment Configuration Complete - Ready for Deployment"
+        )
         
         # Update project state
-        project_state["deployment_plan"] = response.text
+        await update_project_state(deployment_plan=response_text)
         
         return result
         
@@ -935,46 +1530,24 @@ def devops_engineer(environment: str = "production", deployment_type: str = "clo
 # TEAM MEMBER 8: DOCUMENTATION SPECIALIST
 # =============================================================================
 
-@mcp.tool()
-def documentation_specialist(doc_type: str = "complete") -> str:
-    """
-    📚 Documentation Specialist - Creates comprehensive project documentation.
-    
-    This agent:
-    - Writes README files
-    - Creates API documentation
-    - Writes user guides
-    - Creates developer onboarding docs
-    - Generates architecture diagrams descriptions
-    
-    Args:
-        doc_type: Type of documentation (readme, api, user_guide, developer_guide, complete)
-    
-    Returns:
-        Professional documentation in Markdown format
-    """
-    if not GEMINI_AVAILABLE:
-        return "❌ Documentation Specialist requires Gemini AI"
-    
-    # Gather all context from project state
-    context = f"""
-    PROJECT: {project_state.get('current_project', 'No project info')}
+DOCUMENTATION_CONTEXT = Template("""
+    PROJECT: $project
     
     REQUIREMENTS:
-    {project_state.get('requirements', 'No requirements')[:2000]}
+    $requirements
     
     ARCHITECTURE:
-    {project_state.get('architecture', 'No architecture')[:2000]}
+    $architecture
     
     IMPLEMENTATION PLAN:
-    {project_state.get('implementation_plan', 'No implementation plan')[:1000]}
-    """
-    
-    doc_prompt = f"""
-    You are an expert Technical Documentation Specialist creating {doc_type} documentation.
+    $implementation_plan
+    """)
+
+DOCUMENTATION_SPECIALIST_PROMPT = Template("""
+    You are an expert Technical Documentation Specialist creating $doc_type documentation.
     
     PROJECT CONTEXT:
-    {context}
+    $context
     
     Create professional, comprehensive documentation:
     
@@ -1048,31 +1621,61 @@ def documentation_specialist(doc_type: str = "complete") -> str:
     
     Use proper Markdown formatting with headers, code blocks, tables, and lists.
     Make it professional and easy to navigate.
+    """)
+
+@mcp.tool()
+async def documentation_specialist(doc_type: str = "complete", ctx: Context = None) -> str:
+    """
+    📚 Documentation Specialist - Creates comprehensive project documentation.
+    
+    This agent:
+    - Writes README files
+    - Creates API documentation
+    - Writes user guides
+    - Creates developer onboarding docs
+    - Generates architecture diagrams descriptions
+    
+    Args:
+        doc_type: Type of documentation (readme, api, user_guide, developer_guide, complete)
+    
+    Returns:
+        Professional documentation in Markdown format
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ Documentation Specialist requires Gemini AI"
+    
+    await refresh_project_state()
+    
+    # Gather all context from project state
+    context = DOCUMENTATION_CONTEXT.substitute(
+        project=project_state.get('current_project') or 'No project info',
+        requirements=get_context_slice('requirements', 2000, 'No requirements'),
+        architecture=get_context_slice('architecture', 2000, 'No architecture'),
+        implementation_plan=get_context_slice('implementation_plan', 1000, 'No implementation plan')
+    )
+    
+    doc_prompt = DOCUMENTATION_SPECIALIST_PROMPT.substitute(
+        doc_type=doc_type,
+        context=context
+    )
     
     try:
-        response = gemini_model.generate_content(
+        response_text = await cached_generate(
             doc_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=8192,
-            )
+            _CFG["docs"],
+            stream_to_client(ctx, "documentation_specialist")
         )
         
-        result = f"""
-{'='*80}
-📚 DOCUMENTATION SPECIALIST - PROJECT DOCUMENTATION
-{'='*80}
-📅 Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-👤 Agent: Documentation Specialist AI
-📋 Documentation Type: {doc_type}
-
-{response.text}
-
-{'='*80}
-✅ Documentation Complete - Ready for Review
-{'='*80}
-"""
+        result = _BANNER.format(
+            sep=SEP,
+            icon="📚",
+            title="DOCUMENTATION SPECIALIST - PROJECT DOCUMENTATION",
+            ts=report_timestamp(),
+            agent="Documentation Specialist AI",
+            details=f"📋 Documentation Type: {doc_type}\n",
+            body=response_text,
+            footer="Documentation Complete - Ready for Review"
+        )
         
         return result
         
@@ -1080,52 +1683,15 @@ def documentation_specialist(doc_type: str = "complete") -> str:
         return f"❌ Documentation Specialist Error: {str(e)}"
 
 # =============================================================================
-# ORCHESTRATOR - THE TEAM COORDINATOR
-# =============================================================================
-
-@mcp.tool()
-def orchestrator(user_request: str, auto_execute: bool = True, execution_mode: str = "full") -> str:
-    """
-    🎯 ORCHESTRATOR - Intelligent team coordinator that manages the entire software development process.
-    
-    This is the main entry point for building applications. The orchestrator:
-    - Analyzes your request
-    - Determines which team members to involve
-    - Executes tasks in the optimal order
-    - Manages dependencies between team members
-    - Combines all outputs into a cohesive project
-    
-    Args:
-        user_request: Your application idea (e.g., "Build a real-time chat application with React and Node.js")
-        auto_execute: Whether to automatically execute the plan (default: True)
-        execution_mode: 
-            - "full" = Complete end-to-end development (all 8 team members)
-            - "planning" = Analysis, research, and architecture only (first 3 team members)
-            - "implementation" = Add implementation and testing (5 team members)
-            - "deployment" = Full project with deployment ready (7 team members)
-            - "custom" = Let orchestrator decide based on request
-    
-    Returns:
-        Complete project deliverables from all team members
-    """
-    if not GEMINI_AVAILABLE:
-        return "❌ Orchestrator requires Gemini AI for intelligent coordination"
-    
-    # Reset project state for new project
-    project_state["current_project"] = user_request
-    project_state["requirements"] = None
-    project_state["architecture"] = None
-    project_state["implementation_plan"] = None
-    project_state["code_modules"] = {}
-    project_state["deployment_plan"] = None
-    
-    # Step 1: Analyze the request and create execution plan
-    analysis_prompt = f"""
+# ORCHESTRATOR - THE TEAM COORDINATOR
+# =============================================================================
+
+ORCHESTRATOR_ANALYSIS_PROMPT = Template("""
     You are the Orchestrator AI coordinating a team of 8 software engineering specialists.
     
-    USER REQUEST: "{user_request}"
+    USER REQUEST: "$user_request"
     
-    EXECUTION MODE: {execution_mode}
+    EXECUTION MODE: $execution_mode
     
     AVAILABLE TEAM MEMBERS:
     1. 🎯 product_analyst - Analyzes requirements and creates specifications
@@ -1145,55 +1711,231 @@ def orchestrator(user_request: str, auto_execute: bool = True, execution_mode: s
     - "custom": Intelligently choose based on request complexity
     
     Analyze the request and respond with JSON:
-    {{
+    {
         "project_name": "Suggested project name",
         "complexity": "simple|moderate|complex|enterprise",
         "analysis": "Brief analysis of what needs to be built",
         "recommended_mode": "Recommended execution mode if custom",
         "team_workflow": [
-            {{
+            {
                 "step": 1,
                 "agent": "product_analyst",
-                "parameters": {{"user_request": "...", "additional_context": "..."}},
+                "parameters": {"user_request": "...", "additional_context": "..."},
                 "reason": "Why this agent is needed",
-                "estimated_time": "Time estimate"
-            }},
-            {{
+                "estimated_time": "Time estimate",
+                "depends_on": []
+            },
+            {
                 "step": 2,
                 "agent": "research_engineer",
-                "parameters": {{"topic": "...", "focus_areas": ["..."]}},
+                "parameters": {"topic": "...", "focus_areas": ["..."]},
                 "reason": "Why this agent is needed",
                 "estimated_time": "Time estimate",
                 "depends_on": [1]
-            }}
+            }
         ],
         "key_modules": ["List of main modules to implement if senior_developer is involved"],
         "success_criteria": ["How we'll know the project is complete"],
         "estimated_total_time": "Overall project timeline"
-    }}
+    }
     
     Be smart about:
     - What needs to be researched
     - Which modules need custom implementation
-    - Dependencies between team members
+    - Dependencies between team members (give every step a "depends_on" list;
+      steps whose dependencies are complete run in parallel)
     - Optimal execution order
+    """)
+
+ORCHESTRATOR_SUMMARY_PROMPT = Template("""
+    You are the Orchestrator AI providing a final project summary.
+    
+    ORIGINAL REQUEST: $user_request
+    
+    PROJECT NAME: $project_name
+    
+    TEAM OUTPUTS SUMMARY:
+    $team_outputs
+    
+    Create a comprehensive project delivery summary:
+    
+    1. 🎯 **PROJECT OVERVIEW**
+       - What was built
+       - Key features delivered
+       - Technology stack used
+    
+    2. ✅ **DELIVERABLES CHECKLIST**
+       - Mark what was completed by each team member
+       - Highlight key artifacts created
+    
+    3. 📊 **PROJECT STATUS**
+       - Overall completion status
+       - Quality assessment
+       - Readiness for next phase
+    
+    4. 🚀 **NEXT STEPS**
+       - What the user should do next
+       - How to use the deliverables
+       - Recommended actions
+    
+    5. 💡 **KEY INSIGHTS & RECOMMENDATIONS**
+       - Important architectural decisions made
+       - Best practices applied
+       - Things to consider for future development
+    
+    6. 📁 **ARTIFACT LOCATIONS**
+       - Where to find each deliverable in the conversation
+       - How to use each artifact
+    
+    Be concise but comprehensive. This is the executive summary.
+    """)
+
+def step_id(value) -> Optional[int]:
+    """A plan step number as an int, or None when the plan gave something else"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def collapse_module_steps(workflow: List[Dict], agent: str, batch_agent: str) -> List[Dict]:
+    """
+    Merge every `agent` step of a workflow into one `batch_agent` step covering all their modules.
+    
+    Expects depends_on already resolved to sets of step numbers. The merged step takes the
+    first step's number and position, and steps that depended on any merged step depend on it.
+    """
+    steps = [step_info for step_info in workflow if step_info.get('agent') == agent]
+    if len(steps) < 2:
+        return workflow
+    
+    merged_ids = {step_info.get('step', 0) for step_info in steps}
+    merged_step = steps[0].get('step', 0)
+    merged = {
+        "step": merged_step,
+        "agent": batch_agent,
+        "parameters": {"modules": [step_info.get('parameters', {}) for step_info in steps]},
+        "depends_on": set().union(*(step_info['depends_on'] for step_info in steps)) - merged_ids
+    }
+    
+    collapsed = []
+    for step_info in workflow:
+        if step_info.get('agent') == agent:
+            if step_info is steps[0]:
+                collapsed.append(merged)
+            continue
+        if step_info['depends_on'] & merged_ids:
+            step_info = {**step_info, 'depends_on': step_info['depends_on'] - merged_ids | {merged_step}}
+        collapsed.append(step_info)
+    return collapsed
+
+# Workflow step runners by agent name: each takes the step's parameters, the
+# user request and the MCP context, and returns the agent's coroutine
+AGENT_DISPATCH: Dict[str, Callable[[Dict, str, Optional[Context]], Awaitable[str]]] = {
+    "product_analyst": lambda p, ur, ctx: product_analyst(
+        p.get('user_request', ur), p.get('additional_context', ''), ctx
+    ),
+    "research_engineer": lambda p, ur, ctx: research_engineer(
+        p.get('topic', ur), p.get('focus_areas', []), ctx
+    ),
+    "software_architect": lambda p, ur, ctx: software_architect(
+        p.get('requirements'), p.get('research_findings'), ctx
+    ),
+    "technical_lead": lambda p, ur, ctx: technical_lead(p.get('architecture'), ctx),
+    "senior_developer": lambda p, ur, ctx: senior_developer(
+        p.get('module_name', 'main_module'),
+        p.get('specifications', 'Implement according to architecture'),
+        p.get('language', 'python'),
+        ctx
+    ),
+    "senior_developer_batch": lambda p, ur, ctx: senior_developer_batch(
+        p.get('modules', []), p.get('language', 'python'), ctx
+    ),
+    "qa_engineer": lambda p, ur, ctx: qa_engineer(
+        p.get('module_name', 'main_module'), p.get('code'), p.get('test_type', 'comprehensive'), ctx
+    ),
+    "qa_engineer_batch": lambda p, ur, ctx: qa_engineer_batch(
+        p.get('modules', []), p.get('test_type', 'comprehensive'), ctx
+    ),
+    "devops_engineer": lambda p, ur, ctx: devops_engineer(
+        p.get('environment', 'production'), p.get('deployment_type', 'cloud'), ctx
+    ),
+    "documentation_specialist": lambda p, ur, ctx: documentation_specialist(p.get('doc_type', 'complete'), ctx),
+}
+
+# Report headings for the agents, e.g. "SENIOR DEVELOPER"
+AGENT_DISPLAY: Dict[str, str] = {name: name.upper().replace('_', ' ') for name in AGENT_DISPATCH}
+
+
+def agent_display_name(agent: str) -> str:
+    """Heading for an agent name, also for names the plan made up"""
+    return AGENT_DISPLAY.get(agent) or agent.upper().replace('_', ' ')
+
+# Full step outputs of each orchestrator run are written to ARTIFACTS_DIR/<run id>/;
+# the report itself carries a short preview and the file's path
+ARTIFACTS_DIR = Path.home() / ".mcp_artifacts"
+_PREVIEW_CHARS = 800
+
+
+def _write_artifact(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+@mcp.tool()
+@with_run_timestamp
+async def orchestrator(user_request: str, auto_execute: bool = True, execution_mode: str = "full", ctx: Context = None) -> str:
+    """
+    🎯 ORCHESTRATOR - Intelligent team coordinator that manages the entire software development process.
+    
+    This is the main entry point for building applications. The orchestrator:
+    - Analyzes your request
+    - Determines which team members to involve
+    - Executes tasks in the optimal order
+    - Manages dependencies between team members
+    - Combines all outputs into a cohesive project
+    
+    Args:
+        user_request: Your application idea (e.g., "Build a real-time chat application with React and Node.js")
+        auto_execute: Whether to automatically execute the plan (default: True)
+        execution_mode: 
+            - "full" = Complete end-to-end development (all 8 team members)
+            - "planning" = Analysis, research, and architecture only (first 3 team members)
+            - "implementation" = Add implementation and testing (5 team members)
+            - "deployment" = Full project with deployment ready (7 team members)
+            - "custom" = Let orchestrator decide based on request
+    
+    Returns:
+        Complete project deliverables from all team members
     """
+    if not GEMINI_AVAILABLE:
+        return "❌ Orchestrator requires Gemini AI for intelligent coordination"
+    
+    # Reset project state for new project
+    await start_project(user_request)
+    
+    # Step 1: Analyze the request and create execution plan
+    analysis_prompt = ORCHESTRATOR_ANALYSIS_PROMPT.substitute(
+        user_request=user_request,
+        execution_mode=execution_mode
+    )
     
     try:
         print("\n🤔 Orchestrator analyzing request...")
-        analysis_response = gemini_model.generate_content(
+        # Stream the plan and stop as soon as its JSON object is complete
+        plan_tracker = JsonObjectTracker()
+        
+        async def plan_complete(text: str) -> bool:
+            return plan_tracker.feed(text) >= 0
+        
+        analysis_text = await cached_generate(
             analysis_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,
-                max_output_tokens=4096,
-            )
+            _CFG["plan"],
+            plan_complete
         )
         
         # Extract JSON from response
-        analysis_text = analysis_response.text
-        json_match = re.search(r'\{.*\}', analysis_text, re.DOTALL)
+        json_match = extract_json(analysis_text)
         if json_match:
-            plan = json.loads(json_match.group())
+            plan = orjson.loads(json_match)
         else:
             return f"❌ Could not parse orchestrator analysis: {analysis_text}"
             
@@ -1201,11 +1943,11 @@ def orchestrator(user_request: str, auto_execute: bool = True, execution_mode: s
         return f"❌ Orchestrator Analysis Error: {str(e)}"
     
     # Step 2: Show the execution plan
-    plan_summary = f"""
-{'='*80}
+    plan_parts = [f"""
+{SEP}
 🎯 ORCHESTRATOR - AI SOFTWARE ENGINEERING TEAM
-{'='*80}
-📅 Project Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{SEP}
+📅 Project Start: {report_timestamp()}
 🏢 Project: {plan.get('project_name', 'Unnamed Project')}
 📊 Complexity: {plan.get('complexity', 'Unknown').upper()}
 ⏱️ Estimated Time: {plan.get('estimated_total_time', 'Unknown')}
@@ -1217,7 +1959,7 @@ def orchestrator(user_request: str, auto_execute: bool = True, execution_mode: s
 {chr(10).join([f"  • {criteria}" for criteria in plan.get('success_criteria', [])])}
 
 🔧 TEAM WORKFLOW ({len(plan.get('team_workflow', []))} steps):
-"""
+"""]
     
     for step_info in plan.get('team_workflow', []):
         step_num = step_info.get('step', 0)
@@ -1226,172 +1968,231 @@ def orchestrator(user_request: str, auto_execute: bool = True, execution_mode: s
         time = step_info.get('estimated_time', 'Unknown')
         depends = step_info.get('depends_on', [])
         
-        plan_summary += f"\n  Step {step_num}: {agent.upper().replace('_', ' ')}"
-        plan_summary += f"\n    ⏱️  Time: {time}"
-        plan_summary += f"\n    💡 Reason: {reason}"
-        if depends:
-            plan_summary += f"\n    🔗 Depends on steps: {', '.join(map(str, depends))}"
-        plan_summary += "\n"
+        pretty_agent = agent_display_name(str(agent))
+        
+        step_lines = [
+            f"  Step {step_num}: {pretty_agent}",
+            f"    ⏱️  Time: {time}",
+            f"    💡 Reason: {reason}"
+        ]
+        if depends and isinstance(depends, list):
+            step_lines.append(f"    🔗 Depends on steps: {', '.join(map(str, depends))}")
+        plan_parts.append("\n" + "\n".join(step_lines) + "\n")
     
     if plan.get('key_modules'):
-        plan_summary += f"\n📦 KEY MODULES TO IMPLEMENT:\n"
+        plan_parts.append(f"\n📦 KEY MODULES TO IMPLEMENT:\n")
         for module in plan['key_modules']:
-            plan_summary += f"  • {module}\n"
+            plan_parts.append(f"  • {module}\n")
     
     if not auto_execute:
-        plan_summary += f"\n\n💡 Set auto_execute=True to execute this plan automatically."
-        return plan_summary
+        plan_parts.append(f"\n\n💡 Set auto_execute=True to execute this plan automatically.")
+        return "".join(plan_parts)
     
     # Step 3: Execute the workflow
-    plan_summary += f"\n\n{'='*80}\n🚀 EXECUTING TEAM WORKFLOW\n{'='*80}\n"
+    plan_parts.append(f"\n\n{SEP}\n🚀 EXECUTING TEAM WORKFLOW\n{SEP}\n")
     
     results = {}
     workflow_outputs = []
+    step_cache: Dict[tuple, asyncio.Future] = {}
+    run_dir = ARTIFACTS_DIR / uuid.uuid4().hex[:8]
     
-    for step_info in plan.get('team_workflow', []):
+    async def run_step(index: int, step_info: Dict) -> tuple:
+        """Execute the workflow's index-th step, returning (output, succeeded, artifact path or None)"""
         agent_name = step_info.get('agent', '')
         parameters = step_info.get('parameters', {})
         step_num = step_info.get('step', 0)
         
         print(f"\n▶️  Step {step_num}: Executing {agent_name}...")
-        plan_summary += f"\n{'─'*80}\n▶️  STEP {step_num}: {agent_name.upper().replace('_', ' ')}\n{'─'*80}\n"
         
         try:
-            # Execute the appropriate agent
-            if agent_name == "product_analyst":
-                result = product_analyst(
-                    parameters.get('user_request', user_request),
-                    parameters.get('additional_context', '')
-                )
-            elif agent_name == "research_engineer":
-                result = research_engineer(
-                    parameters.get('topic', user_request),
-                    parameters.get('focus_areas', [])
-                )
-            elif agent_name == "software_architect":
-                result = software_architect(
-                    parameters.get('requirements'),
-                    parameters.get('research_findings')
-                )
-            elif agent_name == "technical_lead":
-                result = technical_lead(parameters.get('architecture'))
-            elif agent_name == "senior_developer":
-                # For senior developer, we might need to implement multiple modules
-                module_name = parameters.get('module_name', 'main_module')
-                result = senior_developer(
-                    module_name,
-                    parameters.get('specifications', 'Implement according to architecture'),
-                    parameters.get('language', 'python')
-                )
-            elif agent_name == "qa_engineer":
-                result = qa_engineer(
-                    parameters.get('module_name', 'main_module'),
-                    parameters.get('code'),
-                    parameters.get('test_type', 'comprehensive')
-                )
-            elif agent_name == "devops_engineer":
-                result = devops_engineer(
-                    parameters.get('environment', 'production'),
-                    parameters.get('deployment_type', 'cloud')
-                )
-            elif agent_name == "documentation_specialist":
-                result = documentation_specialist(parameters.get('doc_type', 'complete'))
+            handler = AGENT_DISPATCH.get(agent_name)
+            if handler:
+                # A step that repeats an earlier step's agent and parameters reuses its run
+                cache_key = (agent_name, tuple(sorted((k, repr(v)) for k, v in parameters.items())))
+                task = step_cache.get(cache_key)
+                if task is None:
+                    task = step_cache[cache_key] = asyncio.ensure_future(handler(parameters, user_request, ctx))
+                result = await task
             else:
                 result = f"❌ Unknown agent: {agent_name}"
             
-            results[agent_name] = result
-            workflow_outputs.append(result)
-            
-            # Show abbreviated result in summary
-            result_preview = result[:800] + "..." if len(result) > 800 else result
-            plan_summary += f"{result_preview}\n"
-            
         except Exception as e:
             error_msg = f"❌ Error executing {agent_name}: {str(e)}"
             print(error_msg)
-            plan_summary += f"{error_msg}\n"
-            results[agent_name] = error_msg
+            return error_msg, False, None
+        
+        # Save the full output as soon as the step finishes. The file name is built
+        # from the step's position and a known agent name only, never from plan text
+        artifact = run_dir / f"{index + 1}_{agent_name if agent_name in AGENT_DISPATCH else 'unknown'}.md"
+        try:
+            if not artifact.resolve().is_relative_to(run_dir.resolve()):
+                raise OSError(f"{artifact} is outside {run_dir}")
+            await asyncio.to_thread(_write_artifact, artifact, result)
+        except OSError as e:
+            print(f"⚠️  Could not save step {step_num} output: {e}")
+            artifact = None
+        return result, True, artifact
+    
+    # Run the workflow as a dependency graph: each wave starts every step whose
+    # depends_on steps have finished. A step without depends_on waits for the one
+    # listed before it, and so does one whose depends_on is not a list; unknown or
+    # circular dependencies fall back to plan order. Step numbers are coerced to
+    # int, so "2" and 2 name the same step.
+    workflow = plan.get('team_workflow', [])
+    ids = [step_id(step_info.get('step', 0)) for step_info in workflow]
+    step_ids = set(ids) - {None}
+    resolved = []
+    for i, step_info in enumerate(workflow):
+        if isinstance(step_info.get('depends_on'), list):
+            depends = {step_id(d) for d in step_info['depends_on']} & step_ids
+        else:
+            depends = {ids[i - 1]} & step_ids if i else set()
+        # Interned names match AGENT_DISPATCH's literal keys by identity
+        agent = sys.intern(str(step_info.get('agent', '')))
+        resolved.append({**step_info, 'step': ids[i], 'agent': agent, 'depends_on': depends})
+    workflow = resolved
+    
+    # With several key modules, implement them in one request and test them in another
+    if len(plan.get('key_modules') or []) >= 2:
+        workflow = collapse_module_steps(workflow, "senior_developer", "senior_developer_batch")
+        workflow = collapse_module_steps(workflow, "qa_engineer", "qa_engineer_batch")
+    deps = [step_info['depends_on'] for step_info in workflow]
+    
+    finished = set()
+    pending = list(range(len(workflow)))
+    while pending:
+        ready = [i for i in pending if deps[i] <= finished] or pending[:1]
+        pending = [i for i in pending if i not in ready]
+        outcomes = await asyncio.gather(*[run_step(i, workflow[i]) for i in ready])
+        
+        for i, (result, succeeded, artifact) in zip(ready, outcomes):
+            agent_name = workflow[i].get('agent', '')
+            step_num = workflow[i].get('step', 0)
+            finished.add(step_num)
+            
+            plan_parts.append(f"\n{SEP_THIN}\n▶️  STEP {i + 1 if step_num is None else step_num}: {agent_display_name(agent_name)}\n{SEP_THIN}\n")
+            results[agent_name] = result
+            
+            if succeeded:
+                workflow_outputs.append(result)
+                # Show abbreviated result in summary
+                result_preview = result[:_PREVIEW_CHARS] + "..." if len(result) > _PREVIEW_CHARS else result
+                plan_parts.append(f"{result_preview}\n")
+                if artifact:
+                    plan_parts.append(f"📄 Full output: {artifact}\n")
+            else:
+                plan_parts.append(f"{result}\n")
     
     # Step 4: Generate project summary
-    summary_prompt = f"""
-    You are the Orchestrator AI providing a final project summary.
-    
-    ORIGINAL REQUEST: {user_request}
-    
-    PROJECT NAME: {plan.get('project_name', 'Unnamed Project')}
-    
-    TEAM OUTPUTS SUMMARY:
-    {json.dumps({k: str(v)[:500] + "..." for k, v in results.items()}, indent=2)}
-    
-    Create a comprehensive project delivery summary:
-    
-    1. 🎯 **PROJECT OVERVIEW**
-       - What was built
-       - Key features delivered
-       - Technology stack used
-    
-    2. ✅ **DELIVERABLES CHECKLIST**
-       - Mark what was completed by each team member
-       - Highlight key artifacts created
-    
-    3. 📊 **PROJECT STATUS**
-       - Overall completion status
-       - Quality assessment
-       - Readiness for next phase
-    
-    4. 🚀 **NEXT STEPS**
-       - What the user should do next
-       - How to use the deliverables
-       - Recommended actions
-    
-    5. 💡 **KEY INSIGHTS & RECOMMENDATIONS**
-       - Important architectural decisions made
-       - Best practices applied
-       - Things to consider for future development
-    
-    6. 📁 **ARTIFACT LOCATIONS**
-       - Where to find each deliverable in the conversation
-       - How to use each artifact
-    
-    Be concise but comprehensive. This is the executive summary.
-    """
+    summary_prompt = ORCHESTRATOR_SUMMARY_PROMPT.substitute(
+        user_request=user_request,
+        project_name=plan.get('project_name', 'Unnamed Project'),
+        team_outputs=orjson.dumps(
+            {k: str(v)[:500] + "..." for k, v in results.items()},
+            option=orjson.OPT_INDENT_2
+        ).decode()
+    )
     
     try:
         print("\n📊 Generating final project summary...")
-        summary_response = gemini_model.generate_content(
+        summary_text = await cached_generate(
             summary_prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.4,
-                max_output_tokens=4096,
-            )
+            _CFG["summary"],
+            stream_to_client(ctx, "orchestrator")
         )
         
-        plan_summary += f"\n\n{'='*80}\n🎯 PROJECT DELIVERY SUMMARY\n{'='*80}\n\n{summary_response.text}\n"
+        plan_parts.append(f"\n\n{SEP}\n🎯 PROJECT DELIVERY SUMMARY\n{SEP}\n\n{summary_text}\n")
         
     except Exception as e:
-        plan_summary += f"\n\n❌ Error generating summary: {str(e)}"
+        plan_parts.append(f"\n\n❌ Error generating summary: {str(e)}")
     
     # Final output
-    plan_summary += f"\n\n{'='*80}\n✅ PROJECT COMPLETE\n{'='*80}\n"
-    plan_summary += f"📅 Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    plan_summary += f"👥 Team Members Involved: {len(results)}\n"
-    plan_summary += f"📦 Artifacts Generated: {len(workflow_outputs)}\n"
-    plan_summary += f"\n💡 All detailed outputs are available above. Scroll up to see complete deliverables from each team member.\n"
+    plan_parts.append(f"\n\n{SEP}\n✅ PROJECT COMPLETE\n{SEP}\n")
+    plan_parts.append(f"📅 Completed: {datetime.now().isoformat(sep=' ', timespec='seconds')}\n")
+    plan_parts.append(f"👥 Team Members Involved: {len(results)}\n")
+    plan_parts.append(f"📦 Artifacts Generated: {len(workflow_outputs)}\n")
+    if run_dir.is_dir():
+        plan_parts.append(f"\n💡 Complete deliverables from each team member are saved in {run_dir}\n")
+    else:
+        plan_parts.append(f"\n💡 All detailed outputs are available above. Scroll up to see complete deliverables from each team member.\n")
     
-    return plan_summary
+    return "".join(plan_parts)
+
+# =============================================================================
+# PIPELINE - FIXED TEAM WORKFLOW
+# =============================================================================
+
+@mcp.tool()
+@with_run_timestamp
+async def run_pipeline(user_request: str, modules: List[str] = None, language: str = "python", ctx: Context = None) -> str:
+    """
+    ⚡ Pipeline - Runs the standard team workflow without an orchestrator planning step.
+
+    Stages that don't depend on each other run concurrently:
+    - Product Analyst and Research Engineer work in parallel
+    - Software Architect and Technical Lead follow in order
+    - Senior Developer implements all modules in parallel, then QA Engineer tests them in parallel
+    - DevOps Engineer and Documentation Specialist finish in parallel
+
+    Args:
+        user_request: Your application idea (e.g., "Build a task management app with React and Node.js")
+        modules: Names of the modules to implement (implementation and testing are skipped if empty)
+        language: Programming language for the modules (python, javascript, typescript, etc.)
+
+    Returns:
+        Combined deliverables from every stage
+    """
+    if not GEMINI_AVAILABLE:
+        return "❌ Pipeline requires Gemini AI"
+
+    started_at = report_timestamp()
+
+    # Reset project state for new project
+    await start_project(user_request)
+
+    analysis, research = await asyncio.gather(
+        product_analyst(user_request, ctx=ctx),
+        research_engineer(user_request, ctx=ctx)
+    )
+    architecture = await software_architect(research_findings=research, ctx=ctx)
+    implementation_plan = await technical_lead(ctx=ctx)
+    outputs = [analysis, research, architecture, implementation_plan]
+
+    if modules:
+        outputs.extend(await asyncio.gather(*[
+            senior_developer(module, f"Implement the {module} module according to the architecture", language, ctx)
+            for module in modules
+        ]))
+        outputs.extend(await asyncio.gather(*[qa_engineer(module, ctx=ctx) for module in modules]))
+
+    outputs.extend(await asyncio.gather(devops_engineer(ctx=ctx), documentation_specialist(ctx=ctx)))
+
+    header = f"""
+{SEP}
+⚡ PIPELINE - AI SOFTWARE ENGINEERING TEAM
+{SEP}
+📅 Project Start: {started_at}
+📅 Completed: {datetime.now().isoformat(sep=' ', timespec='seconds')}
+🏢 Project: {user_request}
+📦 Artifacts Generated: {len(outputs)}
+"""
+
+    return header + "\n".join(outputs)
 
 # =============================================================================
 # UTILITY TOOLS
 # =============================================================================
 
 @mcp.tool()
-def team_status() -> Dict:
+async def team_status() -> Dict:
     """
     Get current status of the AI software engineering team and ongoing project.
     
     Returns:
         Status of all team members and current project state
     """
+    await refresh_project_state()
+    state = project_state
     return {
         "server_version": "2.0.0 - AI Software Engineering Team",
         "team_size": 8,
@@ -1411,18 +2212,36 @@ def team_status() -> Dict:
             "📚 documentation_specialist - Documentation"
         ],
         "current_project": {
-            "name": project_state.get("current_project", "No active project"),
-            "has_requirements": project_state.get("requirements") is not None,
-            "has_architecture": project_state.get("architecture") is not None,
-            "has_implementation_plan": project_state.get("implementation_plan") is not None,
-            "code_modules_count": len(project_state.get("code_modules", {})),
-            "has_deployment_plan": project_state.get("deployment_plan") is not None
+            "name": state.get("current_project", "No active project"),
+            "has_requirements": state.get("requirements") is not None,
+            "has_architecture": state.get("architecture") is not None,
+            "has_implementation_plan": state.get("implementation_plan") is not None,
+            "code_modules_count": len(state.get("code_modules", {})),
+            "has_deployment_plan": state.get("deployment_plan") is not None
         },
         "usage_tip": "Call orchestrator(your_request) to start building an application with the full team!"
     }
 
 @mcp.tool()
-def export_project_files(output_directory: str = "generated_project", include_docs: bool = True) -> str:
+def cache_stats() -> Dict:
+    """
+    Show how often Gemini responses were served from the response cache.
+    
+    Returns:
+        Cache backend, TTL and hit/miss counts for this server process
+    """
+    hits = llm_cache.stats["hits"]
+    misses = llm_cache.stats["misses"]
+    return {
+        "backend": type(llm_cache.backend).__name__,
+        "ttl_seconds": llm_cache.ttl,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0
+    }
+
+@mcp.tool()
+async def export_project_files(output_directory: str = "generated_project", include_docs: bool = True) -> str:
     """
     Export all project artifacts to a structured folder with code files and documentation.
     
@@ -1433,100 +2252,60 @@ def export_project_files(output_directory: str = "generated_project", include_do
     Returns:
         Status message with export details and folder structure
     """
+    await refresh_project_state()
     if not project_state.get("current_project"):
         return "❌ No active project to export. Run orchestrator() first to generate a project."
     
-    try:
-        # Create base directory
-        base_path = Path(output_directory)
-        if base_path.exists():
-            # Create backup of existing directory
-            backup_path = Path(f"{output_directory}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-            shutil.move(str(base_path), str(backup_path))
-        
-        base_path.mkdir(exist_ok=True)
-        
-        # Create project structure
-        folders_created = []
-        files_created = []
-        
-        # 1. Create main project folders
-        (base_path / "src").mkdir(exist_ok=True)
-        (base_path / "tests").mkdir(exist_ok=True)
-        (base_path / "docs").mkdir(exist_ok=True)
-        (base_path / "config").mkdir(exist_ok=True)
-        (base_path / "scripts").mkdir(exist_ok=True)
-        folders_created.extend(["src", "tests", "docs", "config", "scripts"])
-        
-        # 2. Export code modules
-        code_modules = project_state.get("code_modules", {})
-        for module_name, module_content in code_modules.items():
-            # Determine file extension based on content
-            if "import React" in str(module_content) or "jsx" in module_name.lower():
-                file_ext = ".jsx"
-                folder = "src/components"
-            elif "from flask" in str(module_content) or "app.py" in module_name:
-                file_ext = ".py"
-                folder = "src"
-            elif "package.json" in module_name:
-                file_ext = ".json"
-                folder = ""
-            elif "dockerfile" in module_name.lower():
-                file_ext = ""
-                folder = "config"
-            elif "test" in module_name.lower():
-                file_ext = ".py" if "python" in str(module_content).lower() else ".js"
-                folder = "tests"
-            else:
-                file_ext = ".py"  # default
-                folder = "src"
-            
-            # Create subfolder if needed
-            if folder:
-                (base_path / folder).mkdir(parents=True, exist_ok=True)
-                file_path = base_path / folder / f"{module_name}{file_ext}"
-            else:
-                file_path = base_path / f"{module_name}{file_ext}"
-            
-            # Write module content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(str(module_content))
-            files_created.append(str(file_path.relative_to(base_path)))
-        
-        # 3. Export requirements/architecture documents
-        if project_state.get("requirements"):
-            req_file = base_path / "docs" / "requirements.md"
-            with open(req_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Project Requirements\n\n{project_state['requirements']}")
-            files_created.append("docs/requirements.md")
-        
-        if project_state.get("architecture"):
-            arch_file = base_path / "docs" / "architecture.md"
-            with open(arch_file, 'w', encoding='utf-8') as f:
-                f.write(f"# System Architecture\n\n{project_state['architecture']}")
-            files_created.append("docs/architecture.md")
-        
-        if project_state.get("implementation_plan"):
-            plan_file = base_path / "docs" / "implementation_plan.md"
-            with open(plan_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Implementation Plan\n\n{project_state['implementation_plan']}")
-            files_created.append("docs/implementation_plan.md")
-        
-        if project_state.get("deployment_plan"):
-            deploy_file = base_path / "docs" / "deployment.md"
-            with open(deploy_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Deployment Guide\n\n{project_state['deployment_plan']}")
-            files_created.append("docs/deployment.md")
-        
-        # 4. Create README.md
-        readme_content = f"""# {project_state.get('current_project', 'Generated Project')}
+    # Take a snapshot and do the blocking file I/O in a worker thread so the
+    # event loop keeps serving other requests during the export
+    state = {**project_state, "code_modules": dict(project_state["code_modules"])}
+    return await asyncio.to_thread(_export_project_files, state, output_directory, include_docs)
+
+
+# How exported code modules are placed, checked in order: a module goes to the
+# first row whose marker appears near the top of its code or in its lowercased name
+_MODULE_MARKERS = (
+    # (code marker, name marker, file extension, folder)
+    ("import react", "jsx", ".jsx", "src/components"),
+    ("from flask", "app.py", ".py", "src"),
+    (None, "package.json", ".json", ""),
+    (None, "dockerfile", "", "config"),
+)
+_MARKER_SCAN_CHARS = 4096
+_EXPORT_FOLDERS = ["src", "tests", "docs", "config", "scripts"]
+EXPORT_WRITERS = 8  # threads writing code modules
+
+
+def _module_location(module_name: str, code: str) -> tuple:
+    """File extension and folder for an exported code module"""
+    head = code[:_MARKER_SCAN_CHARS].lower()
+    name = module_name.lower()
+    for code_marker, name_marker, file_ext, folder in _MODULE_MARKERS:
+        if (code_marker and code_marker in head) or name_marker in name:
+            return file_ext, folder
+    if "test" in name:
+        return (".py" if "python" in head else ".js"), "tests"
+    return ".py", "src"  # default
+
+
+# Project state documents exported to docs/: (state key, file name, heading)
+_DOC_FILES = (
+    ("requirements", "requirements.md", "Project Requirements"),
+    ("architecture", "architecture.md", "System Architecture"),
+    ("implementation_plan", "implementation_plan.md", "Implementation Plan"),
+    ("deployment_plan", "deployment.md", "Deployment Guide"),
+)
+
+# README.md and .gitignore written by export_project_files; the README's {fields}
+# are filled in per export
+_README_TEMPLATE = """# {project}
 
 ## Project Overview
 This project was generated by the AI Software Engineering Team.
 
 ## Project Structure
 ```
-{output_directory}/
+{output_dir}/
 ├── src/                 # Source code
 ├── tests/              # Test files
 ├── docs/               # Documentation
@@ -1536,7 +2315,7 @@ This project was generated by the AI Software Engineering Team.
 ```
 
 ## Generated Files
-{chr(10).join([f'- {file}' for file in files_created])}
+{files_list}
 
 ## Getting Started
 1. Review the documentation in the `docs/` folder
@@ -1554,16 +2333,10 @@ This project was generated by the AI Software Engineering Team.
 - 📚 Documentation Specialist
 
 ---
-Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated on: {date}
 """
-        
-        readme_file = base_path / "README.md"
-        with open(readme_file, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        files_created.append("README.md")
-        
-        # 5. Create .gitignore
-        gitignore_content = """# Dependencies
+
+_GITIGNORE = """# Dependencies
 node_modules/
 __pycache__/
 *.pyc
@@ -1608,39 +2381,167 @@ build/
 *.tmp
 *.temp
 """
+
+
+# Output directory -> (snapshot digest, {exported file: content digest}, report) of
+# the last export there, so re-exporting an unchanged project can leave it as it is
+_last_exports: Dict[str, tuple] = {}
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _write(path: Path, text: str) -> bytes:
+    """Write text to a file as UTF-8 in a single call, returning the content digest"""
+    data = text.encode('utf-8')
+    path.write_bytes(data)
+    return _digest(data)
+
+
+def _export_intact(base_path: Path, folders: List[str], file_digests: Dict[str, bytes]) -> bool:
+    """Whether an earlier export's folders and files are still on disk unmodified"""
+    if not all((base_path / folder).is_dir() for folder in folders):
+        return False
+    try:
+        return all(
+            _digest((base_path / file).read_bytes()) == digest
+            for file, digest in file_digests.items()
+        )
+    except OSError:
+        return False
+
+
+def _export_project_files(state: Dict, output_directory: str, include_docs: bool) -> str:
+    """Write the project snapshot to disk (runs in a worker thread)"""
+    try:
+        base_path = Path(output_directory)
+        
+        # Nothing to do if the same snapshot was exported here and the files are untouched
+        export_key = str(base_path.resolve())
+        snapshot_digest = _digest(orjson.dumps(
+            {"output_directory": output_directory, "state": state},
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        ))
+        previous = _last_exports.get(export_key)
+        if previous and previous[0] == snapshot_digest and _export_intact(base_path, _EXPORT_FOLDERS, previous[1]):
+            return f"\nℹ️ Project unchanged since its last export; the files in '{output_directory}' were left as they are.\n" + previous[2]
+        
+        # One clock reading names the backup and dates the README and the report
+        now = datetime.now()
+        exported_at = now.isoformat(sep=' ', timespec='seconds')
+        
+        # Create base directory
+        if base_path.exists():
+            # Create backup of existing directory
+            backup_path = Path(f"{output_directory}_backup_{now.strftime('%Y%m%d_%H%M%S')}")
+            try:
+                os.replace(base_path, backup_path)
+            except OSError:
+                # e.g. the backup name is on another filesystem
+                import shutil
+                shutil.move(str(base_path), str(backup_path))
+        
+        base_path.mkdir(exist_ok=True)
+        
+        # Create project structure
+        folders_created = []
+        files_created = []
+        
+        file_digests = {}
+        
+        # 1. Create main project folders
+        for folder in _EXPORT_FOLDERS:
+            (base_path / folder).mkdir(exist_ok=True)
+        folders_created.extend(_EXPORT_FOLDERS)
+        created_dirs = {base_path / folder for folder in folders_created}
+        created_dirs.add(base_path)
+        
+        # 2. Export code modules
+        code_modules = state.get("code_modules", {})
+        module_writes = []
+        for module_name, module_content in code_modules.items():
+            if not isinstance(module_content, str):
+                module_content = str(module_content)
+            # Determine file extension based on content
+            file_ext, folder = _module_location(module_name, module_content)
+            
+            # Create subfolder if needed
+            target = base_path / folder if folder else base_path
+            if target not in created_dirs:
+                target.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(target)
+            filename = f"{module_name}{file_ext}"
+            
+            module_writes.append((target / filename, module_content))
+            files_created.append(f"{folder}/{filename}" if folder else filename)
+        
+        # Write module content; the folders all exist by now, so the files are
+        # independent and can be written concurrently
+        if module_writes:
+            with ThreadPoolExecutor(max_workers=min(EXPORT_WRITERS, len(module_writes))) as pool:
+                digests = pool.map(lambda write: _write(*write), module_writes)
+                file_digests.update(zip(files_created, digests))
+        
+        # 3. Export requirements/architecture documents
+        for key, filename, title in _DOC_FILES:
+            content = state.get(key)
+            if content:
+                file = f"docs/{filename}"
+                file_digests[file] = _write(base_path / file, f"# {title}\n\n{content}")
+                files_created.append(file)
+        
+        # 4. Create README.md
+        readme_content = _README_TEMPLATE.format(
+            project=state.get('current_project', 'Generated Project'),
+            output_dir=output_directory,
+            files_list="\n".join(f'- {file}' for file in files_created),
+            date=exported_at
+        )
+        
+        readme_file = base_path / "README.md"
+        file_digests["README.md"] = _write(readme_file, readme_content)
+        files_created.append("README.md")
         
+        # 5. Create .gitignore
         gitignore_file = base_path / ".gitignore"
-        with open(gitignore_file, 'w', encoding='utf-8') as f:
-            f.write(gitignore_content)
+        file_digests[".gitignore"] = _write(gitignore_file, _GITIGNORE)
         files_created.append(".gitignore")
         
         # Generate summary
+        exported_files = "\n".join(f'  • {file}' for file in sorted(files_created))
+        folder_counts = dict.fromkeys(folders_created, 0)
+        for file in files_created:
+            folder, sep, _ = file.partition("/")
+            if sep and folder in folder_counts:
+                folder_counts[folder] += 1
         result = f"""
-{'='*80}
+{SEP}
 📁 PROJECT EXPORT COMPLETE
-{'='*80}
-📅 Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+{SEP}
+📅 Export Date: {exported_at}
 📂 Output Directory: {output_directory}
-📊 Project: {project_state.get('current_project', 'Unknown')}
+📊 Project: {state.get('current_project', 'Unknown')}
 
 ✅ EXPORT SUMMARY:
   • Folders Created: {len(folders_created)}
   • Files Exported: {len(files_created)}
   • Code Modules: {len(code_modules)}
-  • Documentation Files: {len([f for f in files_created if f.startswith('docs/')])}
+  • Documentation Files: {folder_counts['docs']}
 
 📁 FOLDER STRUCTURE:
 {output_directory}/
-├── src/                 # Source code ({len([f for f in files_created if f.startswith('src/')])} files)
-├── tests/              # Test files ({len([f for f in files_created if f.startswith('tests/')])} files)
-├── docs/               # Documentation ({len([f for f in files_created if f.startswith('docs/')])} files)
-├── config/             # Configuration ({len([f for f in files_created if f.startswith('config/')])} files)
-├── scripts/            # Scripts ({len([f for f in files_created if f.startswith('scripts/')])} files)
+├── src/                 # Source code ({folder_counts['src']} files)
+├── tests/              # Test files ({folder_counts['tests']} files)
+├── docs/               # Documentation ({folder_counts['docs']} files)
+├── config/             # Configuration ({folder_counts['config']} files)
+├── scripts/            # Scripts ({folder_counts['scripts']} files)
 ├── README.md           # Project overview
 └── .gitignore          # Git ignore rules
 
 📋 EXPORTED FILES:
-{chr(10).join([f'  • {file}' for file in sorted(files_created)])}
+{exported_files}
 
 🚀 NEXT STEPS:
 1. Navigate to the '{output_directory}' folder
@@ -1650,63 +2551,61 @@ build/
 5. Use deployment guide for production setup
 
 💡 TIP: You can now work with these files in your preferred IDE!
-{'='*80}
+{SEP}
 """
         
+        _last_exports[export_key] = (snapshot_digest, file_digests, result)
         return result
         
     except Exception as e:
         return f"❌ Export failed: {str(e)}"
 
 @mcp.tool()
-def reset_project() -> str:
+async def reset_project() -> str:
     """
     Reset the current project state to start fresh.
     
     Returns:
         Confirmation message
     """
-    project_state["current_project"] = None
-    project_state["requirements"] = None
-    project_state["architecture"] = None
-    project_state["tech_stack"] = None
-    project_state["implementation_plan"] = None
-    project_state["code_modules"] = {}
-    project_state["testing_results"] = None
-    project_state["deployment_plan"] = None
+    await update_project_state(**{**_EMPTY_STATE, "code_modules": {}})
     
     return "✅ Project state reset successfully. Ready for a new project!"
 
 @mcp.tool()
-def get_project_summary() -> str:
+async def get_project_summary() -> str:
     """
     Get a quick summary of the current project state.
     
     Returns:
         Summary of project progress and available artifacts
     """
-    if not project_state.get("current_project"):
+    await refresh_project_state()
+    state = project_state
+    current_project = state.get("current_project")
+    if not current_project:
         return "ℹ️ No active project. Start one with orchestrator(your_request)!"
+    code_modules = state.get("code_modules", {})
     
     summary = f"""
 🏗️ **CURRENT PROJECT SUMMARY**
 {'='*60}
 
-📋 Project: {project_state.get('current_project', 'Unknown')}
+📋 Project: {current_project}
 
 ✅ Completed Phases:
-  • Requirements Analysis: {'✓' if project_state.get('requirements') else '✗'}
-  • System Architecture: {'✓' if project_state.get('architecture') else '✗'}
-  • Implementation Plan: {'✓' if project_state.get('implementation_plan') else '✗'}
-  • Code Modules: {len(project_state.get('code_modules', {}))} implemented
-  • Deployment Plan: {'✓' if project_state.get('deployment_plan') else '✗'}
+  • Requirements Analysis: {'✓' if state.get('requirements') else '✗'}
+  • System Architecture: {'✓' if state.get('architecture') else '✗'}
+  • Implementation Plan: {'✓' if state.get('implementation_plan') else '✗'}
+  • Code Modules: {len(code_modules)} implemented
+  • Deployment Plan: {'✓' if state.get('deployment_plan') else '✗'}
 
 📦 Available Artifacts:
 """
     
-    if project_state.get('code_modules'):
+    if code_modules:
         summary += "\n  Implemented Modules:\n"
-        for module_name in project_state['code_modules'].keys():
+        for module_name in code_modules:
             summary += f"    • {module_name}\n"
     
     summary += "\n💡 Use individual team member tools to continue development!"
@@ -1743,4 +2642,10 @@ if __name__ == "__main__":
     
     print("\n" + "="*80 + "\n")
     
-    mcp.run(transport="streamable-http")
\ No newline at end of file
+    async def serve():
+        try:
+            await mcp.run_streamable_http_async()
+        finally:
+            await close_http_client()
+    
+    asyncio.run(serve())
\ No newline at end of file